@@ -0,0 +1,35 @@
+"""
+Throughput of bulk resume scoring by process-pool size.
+
+    python benchmarks/bench_batch.py --files 200 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import write_corpus
+from src.utils.batch_scoring import score_resumes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--paragraphs', type=int, default=20)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    job_description = "Python, Docker, Kubernetes, machine learning and leadership."
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(directory, args.files, args.paragraphs)
+        print(f"{'workers':>8} {'seconds':>10} {'resumes/s':>10}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            count = sum(1 for _ in score_resumes([directory], job_description, workers))
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>10.2f} {count / elapsed:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Wall time of serial vs page-parallel PDF extraction by page count.
+
+    python benchmarks/bench_pdf_pages.py --pages 10 50 200 500 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.text_extractor import extract_pdf_pages_parallel
+
+PARAGRAPH = (
+    "Led a team of engineers building Python and Kubernetes services; "
+    "improved deployment frequency and reduced incident rates. "
+) * 12
+
+def write_pdf(path, pages):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), PARAGRAPH, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+def timed(path, pages, workers):
+    start = time.perf_counter()
+    extract_pdf_pages_parallel(path, workers=workers, max_pages=None,
+                               time_limit=None, min_pages=0)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 50, 200, 500])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'serial s':>9} {'parallel s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for pages in args.pages:
+            path = os.path.join(directory, f"{pages}.pdf")
+            write_pdf(path, pages)
+            serial = timed(path, pages, 1)
+            parallel = timed(path, pages, args.workers)
+            print(f"{pages:>6} {serial:>9.3f} {parallel:>11.3f} {serial / parallel:>8.2f}")
+
+if __name__ == '__main__':
+    main()
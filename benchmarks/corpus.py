@@ -0,0 +1,84 @@
+"""
+Deterministic synthetic resumes and job descriptions for benchmarks.
+
+The same seed and size always produce the same text, so timings from
+different runs and machines are measured on identical inputs.
+"""
+import os
+import random
+import sys
+from typing import List
+
+import fitz
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.resume_analyzer import SOFT_SKILLS, TECHNICAL_KEYWORDS
+
+FILLER = (
+    "Delivered features for internal customers and improved reliability of "
+    "services used across the organisation"
+).split()
+
+SECTIONS = ['Summary', 'Experience', 'Projects', 'Education', 'Skills']
+
+JD_FILLER = (
+    "We are looking for an engineer who enjoys ownership and building "
+    "products with a collaborative team"
+).split()
+
+def synthetic_resume(rng: random.Random, paragraphs: int) -> List[str]:
+    """Resume lines: a name, then ``paragraphs`` sentences spread over the usual sections."""
+    lines = ["Jane Doe", "jane.doe@example.com"]
+    per_section = max(1, paragraphs // len(SECTIONS))
+    for section in SECTIONS:
+        lines.append(section)
+        for _ in range(per_section):
+            words = rng.sample(FILLER, 8) + rng.sample(TECHNICAL_KEYWORDS + SOFT_SKILLS, 3)
+            rng.shuffle(words)
+            lines.append(" ".join(words) + ".")
+    return lines
+
+def resume_text(paragraphs: int = 20, seed: int = 0) -> str:
+    return "\n".join(synthetic_resume(random.Random(seed), paragraphs))
+
+def job_description(keywords: int = 8, sentences: int = 6, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    terms = rng.sample(TECHNICAL_KEYWORDS + SOFT_SKILLS, keywords)
+    lines = []
+    for i in range(sentences):
+        words = rng.sample(JD_FILLER, 8)
+        lines.append(" ".join(words).capitalize() + ".")
+    lines.append("Requirements: " + ", ".join(terms) + ".")
+    return "\n".join(lines)
+
+def write_pdf(path: str, lines: List[str], lines_per_page: int = 45) -> None:
+    pdf = fitz.open()
+    for start in range(0, len(lines), lines_per_page):
+        page = pdf.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36),
+                            "\n".join(lines[start:start + lines_per_page]), fontsize=9)
+    pdf.save(path)
+    pdf.close()
+
+def write_docx(path: str, lines: List[str]) -> None:
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+def write_corpus(directory: str, count: int, paragraphs: int, seed: int = 0) -> List[str]:
+    """Write ``count`` resumes alternating PDF and DOCX; returns their paths."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        lines = synthetic_resume(rng, paragraphs)
+        if i % 2:
+            path = os.path.join(directory, f"resume_{i:05d}.docx")
+            write_docx(path, lines)
+        else:
+            path = os.path.join(directory, f"resume_{i:05d}.pdf")
+            write_pdf(path, lines)
+        paths.append(path)
+    return paths
@@ -0,0 +1,165 @@
+"""
+Micro-benchmarks of the analysis path with JSON baselines.
+
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 0.25
+
+With --compare the exit status is 1 when any benchmark's median is more than
+``threshold`` slower than the baseline, so the check can gate a deploy.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit as st
+
+from benchmarks.corpus import job_description, resume_text, write_docx, write_pdf
+from src.utils.image_generator import ResumeImageGenerator
+from src.utils.learning_store import LearningStore
+from src.utils.resume_analyzer import (
+    analyze_resume_sections,
+    calculate_resume_scores,
+    extract_keywords
+)
+from src.utils.section_segmenter import build_resume_data
+from src.utils.session_manager import SessionManager
+from src.utils.text_extractor import extract_text_from_docx, extract_text_from_pdf
+
+class _State(dict):
+    # Stands in for st.session_state outside a Streamlit run
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable[[int], tuple]] = None) -> Dict[str, float]:
+    """Time ``func(*setup(i))`` ``repeat`` times; setup is not timed."""
+    func(*(setup(-1) if setup else ()))  # warm-up
+    samples = []
+    for i in range(repeat):
+        args = setup(i) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'runs': repeat,
+    }
+
+def run(paragraphs: int, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    resume = resume_text(paragraphs)
+    jd = job_description()
+    lines = resume.splitlines()
+    results = {}
+
+    def bench(name, func, setup=None, runs=repeat):
+        if only and not any(pattern in name for pattern in only):
+            return
+        results[name] = measure(func, runs, setup)
+        print(f"{name:<40} {results[name]['median_ms']:>10.2f} ms")
+
+    # Distinct text per benchmark and call, so per-text caches (the section
+    # index, the shared TextDocument) are cold and no benchmark reuses the
+    # work of an earlier one
+    def fresh_text(name):
+        return lambda i: (f"{resume}\nRef {name} {i}",)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = os.path.join(directory, "resume.pdf")
+        docx_path = os.path.join(directory, "resume.docx")
+        write_pdf(pdf_path, lines)
+        write_docx(docx_path, lines)
+        bench('extract_text_from_pdf', lambda: extract_text_from_pdf(pdf_path))
+        bench('extract_text_from_docx', lambda: extract_text_from_docx(docx_path))
+
+        bench('extract_keywords', extract_keywords, fresh_text('extract_keywords'))
+        bench('calculate_resume_scores', lambda text: calculate_resume_scores(text, jd),
+              fresh_text('calculate_resume_scores'))
+        bench('analyze_resume_sections', analyze_resume_sections, fresh_text('analyze_resume_sections'))
+
+        st.session_state = _State()
+        session = SessionManager(learning_store=LearningStore(os.path.join(directory, "learning.sqlite3")))
+        analysis = {
+            'scores': calculate_resume_scores(resume, jd),
+            'keyword_matches': {'matched': extract_keywords(resume)[:5], 'missing': []},
+            'section_analysis': analyze_resume_sections(resume),
+            'ai_suggestions': "- Quantify achievements\n- Lead with impact",
+        }
+        bench('session.add_to_history',
+              lambda text: session.add_to_history(text, analysis, jd), fresh_text('session.add_to_history'))
+        bench('session.get_history', session.get_history)
+        bench('session.get_learned_insights', session.get_learned_insights)
+        bench('session.get_personalized_suggestions',
+              lambda: session.get_personalized_suggestions(resume))
+
+        generator = ResumeImageGenerator()
+        resume_data = build_resume_data(resume)
+
+        def render():
+            generator.cleanup_image_file(generator.create_resume_image(resume_data))
+        bench('create_resume_image', render, runs=max(1, repeat // 4))
+    return results
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Names of benchmarks whose median regressed by more than ``threshold``."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>10} {current['median_ms']:>10.2f}    new")
+            continue
+        ratio = current['median_ms'] / previous['median_ms'] if previous['median_ms'] else 1.0
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<40} {previous['median_ms']:>10.2f} {current['median_ms']:>10.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=40, help="resume size in sentences")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', nargs='+', help="run benchmarks whose name contains any of these")
+    parser.add_argument('--save', help="write results to this JSON baseline")
+    parser.add_argument('--compare', help="JSON baseline to check against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown of the median, as a fraction (default 0.25)")
+    args = parser.parse_args()
+
+    results = run(args.paragraphs, args.repeat, args.only)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'paragraphs': args.paragraphs,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if baseline.get('meta', {}).get('paragraphs') != args.paragraphs:
+            print("warning: baseline was recorded with a different --paragraphs", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+if __name__ == '__main__':
+    main()
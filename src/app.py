@@ -1,13 +1,123 @@
 """
 Main Streamlit application for Resume Enhancement
 """
+import time
+
+_SCRIPT_STARTED = time.perf_counter()
+
+import os
+
 import streamlit as st
 import json
-from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx
-from utils.ai_feedback import initialize_gemini, get_ai_feedback
+from utils.extraction_cache import extract_cached, get_extraction_cache
+from utils.ai_feedback import (
+    initialize_gemini,
+    analyze_resume,
+    build_analysis_pipeline,
+    pipeline_inputs,
+    prompt_stats,
+    stream_pipeline_suggestions
+)
+from utils.metrics import get_registry, span, start_metrics_server
+from utils.pipeline import fingerprint
 from utils.session_manager import SessionManager
-from utils.speech_handler import SpeechHandler
-from utils.image_generator import ResumeImageGenerator
+from utils.section_segmenter import build_resume_data
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Audio and PDF rendering pull in gtts, speech_recognition and reportlab; they
+# are imported on first use and the handlers are shared by every session.
+@st.cache_resource
+def get_speech_handler():
+    from utils.speech_handler import SpeechHandler
+    return SpeechHandler()
+
+@st.cache_resource
+def get_image_generator():
+    from utils.image_generator import ResumeImageGenerator
+    return ResumeImageGenerator()
+
+@st.cache_resource
+def _process_timings():
+    # Survives reruns and sessions, unlike this script's module globals.
+    return {'cold_start': None, 'cold_imports': None, 'runs': 0}
+
+def record_run_timing():
+    """Record how long this script run took; the first run in the process is the cold start."""
+    elapsed = time.perf_counter() - _SCRIPT_STARTED
+    stats = _process_timings()
+    stats['runs'] += 1
+    if stats['cold_start'] is None:
+        stats['cold_start'] = elapsed
+        stats['cold_imports'] = _IMPORTS_DONE - _SCRIPT_STARTED
+    previous = st.session_state.get('last_run_time')
+    st.session_state.last_run_time = elapsed
+    return {
+        'this_run': elapsed,
+        'imports': _IMPORTS_DONE - _SCRIPT_STARTED,
+        'previous_run': previous,
+        'cold_start': stats['cold_start'],
+        'cold_imports': stats['cold_imports'],
+        'runs': stats['runs'],
+    }
+
+@st.cache_resource
+def _metrics_server():
+    # Optional scrape endpoint: set RESUME_ENHANCER_METRICS_PORT to enable
+    port = os.environ.get('RESUME_ENHANCER_METRICS_PORT')
+    return start_metrics_server(int(port)) if port else None
+
+def display_metrics_panel():
+    """Optional debug panel: where the time of recent requests went."""
+    if not st.sidebar.checkbox("🔍 Show performance metrics", value=False):
+        return
+    registry = get_registry()
+    snapshot = registry.snapshot()
+    with st.sidebar.expander("📈 Stage metrics", expanded=True):
+        if not snapshot['spans']:
+            st.caption("No instrumented stages have run yet.")
+        for name, stats in snapshot['spans'].items():
+            st.caption(
+                f"**{name}** · {stats['count']}× · mean {stats['mean_seconds'] * 1000:.1f} ms · "
+                f"max {stats['max_seconds'] * 1000:.1f} ms"
+                + (f" · {stats['errors']} errors" if stats['errors'] else "")
+            )
+        for name, size in snapshot['sizes'].items():
+            st.caption(f"{name}: max {size['max']:.0f} · mean {size['total'] / size['count']:.0f}")
+        for name, value in snapshot['counters'].items():
+            st.caption(f"{name}: {value}")
+        
+        recent = registry.recent(15)
+        if recent:
+            st.write("**Recent spans**")
+            st.text("\n".join(
+                f"{'  ' * record.depth}{record.name} {record.duration * 1000:.1f} ms"
+                for record in recent
+            ))
+        
+        st.download_button("⬇️ Prometheus", registry.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+        st.download_button("⬇️ JSON", registry.to_json(), file_name="metrics.json", mime="application/json")
+
+def display_run_timings(timings):
+    """Sidebar report of cold-start and rerun latency."""
+    with st.sidebar.expander("⏱️ Startup & rerun timings"):
+        st.caption(
+            f"Cold start: {timings['cold_start'] * 1000:.0f} ms "
+            f"(imports {timings['cold_imports'] * 1000:.0f} ms)"
+        )
+        st.caption(
+            f"This run: {timings['this_run'] * 1000:.0f} ms "
+            f"(imports {timings['imports'] * 1000:.0f} ms)"
+        )
+        if timings['previous_run'] is not None:
+            st.caption(f"Previous run: {timings['previous_run'] * 1000:.0f} ms")
+        st.caption(f"Runs in this process: {timings['runs']}")
+
+def get_session_pipeline():
+    """Per-session analysis pipeline; its stage results survive reruns."""
+    if 'analysis_pipeline' not in st.session_state:
+        st.session_state.analysis_pipeline = build_analysis_pipeline()
+    return st.session_state.analysis_pipeline
 
 def display_scores(scores):
     cols = st.columns(len(scores))
@@ -53,39 +163,71 @@ def display_section_analysis(analysis):
                 st.text(details['content'])
             st.info(details['suggestions'])
 
+def display_generation_timings(timings, prompt_stats=None):
+    """Show time-to-first-token, total generation time and prompt size for one request."""
+    if not timings:
+        return
+    source = "cache" if timings.get('cached') else "Gemini"
+    caption = (
+        f"⏱️ First token after {timings.get('time_to_first_token', 0):.2f}s · "
+        f"complete after {timings.get('total_time', 0):.2f}s ({source})"
+    )
+    if prompt_stats:
+        caption += (
+            f" · prompt ~{prompt_stats['prompt_tokens']} tokens "
+            f"({prompt_stats['tokens_saved']} saved by compaction)"
+        )
+    st.caption(caption)
+
 def display_history(session_manager):
     """Display analysis history with expandable details."""
     st.subheader("📚 Analysis History")
     
-    history = session_manager.get_history()
-    if not history:
+    lineages = session_manager.get_history_by_lineage()
+    if not lineages:
         st.info("No analysis history yet. Upload a resume to get started!")
         return
     
-    for i, entry in enumerate(history):
-        # Add modified badge if the entry was user-modified
-        title = f"Analysis {i+1} - {entry['timestamp']}"
-        if entry.get('is_modified', False):
-            title += " 📝 (Modified)"
-        if entry.get('is_latest', False):
-            title += " ⭐ (Latest)"
-            
-        with st.expander(title):
-            st.text_area("Resume Text", entry['resume_text'], height=100)
-            if entry['job_description']:
-                st.text_area("Job Description", entry['job_description'], height=100)
-            
-            results = entry['analysis_results']
-            
-            st.subheader("📊 Scores")
-            display_scores(results['scores'])
-            
-            if 'keyword_matches' in results:
-                st.subheader("🎯 Keywords")
-                display_keyword_matches(results['keyword_matches'])
-            
-            st.subheader("💡 Suggestions")
-            st.markdown(results['ai_suggestions'])
+    footprint = session_manager.memory_footprint()
+    st.caption(
+        f"{footprint['entries']} entries · {footprint['unique_bodies']} unique texts · "
+        f"{footprint['stored_bytes'] / 1024:.1f} KB stored "
+        f"({footprint['uncompressed_bytes'] / 1024:.1f} KB uncompressed)"
+    )
+    
+    # One group per resume lineage, newest version first
+    for versions in lineages.values():
+        latest = versions[-1]
+        if latest['lineage_named']:
+            label = latest['lineage']
+        else:
+            label = next((line.strip() for line in latest['resume_text'].splitlines() if line.strip()), "Untitled resume")
+        st.markdown(f"#### 📄 {label} · {len(versions)} version(s)")
+        
+        for i, entry in reversed(list(enumerate(versions))):
+            # Add modified badge if the entry was user-modified
+            title = f"Version {i+1} - {entry['timestamp']}"
+            if entry.get('is_modified', False):
+                title += " 📝 (Modified)"
+            if entry.get('is_latest', False):
+                title += " ⭐ (Latest)"
+                
+            with st.expander(title):
+                st.text_area("Resume Text", entry['resume_text'], height=100, key=f"history_resume_{entry['lineage']}_{i}")
+                if entry['job_description']:
+                    st.text_area("Job Description", entry['job_description'], height=100, key=f"history_job_{entry['lineage']}_{i}")
+                
+                results = entry['analysis_results']
+                
+                st.subheader("📊 Scores")
+                display_scores(results['scores'])
+                
+                if results.get('keyword_matches'):
+                    st.subheader("🎯 Keywords")
+                    display_keyword_matches(results['keyword_matches'])
+                
+                st.subheader("💡 Suggestions")
+                st.markdown(results['ai_suggestions'])
 
 def display_insights(session_manager):
     """Display insights learned from previous analyses."""
@@ -116,17 +258,22 @@ def display_insights(session_manager):
             st.write(f"- {section.title()}: {count} samples analyzed")
 
 def main():
-    initialize_gemini()
-    session_manager = SessionManager()
-    speech_handler = SpeechHandler()
-    image_generator = ResumeImageGenerator()
-    
+    # Must be the first Streamlit call of every run
     st.set_page_config(
         page_title="AI Resume Enhancer",
         page_icon="📄",
         layout="wide",
         initial_sidebar_state="expanded"
     )
+    _metrics_server()
+    try:
+        render_page()
+    finally:
+        display_run_timings(record_run_timing())
+        display_metrics_panel()
+
+def render_page():
+    session_manager = SessionManager()
     
     st.sidebar.title("⚙️ Options")
     page = st.sidebar.radio("Navigate", ["Resume Analysis", "History & Insights"])
@@ -136,12 +283,24 @@ def main():
         include_job = st.checkbox("Include Job Description", value=True)
         enable_audio = st.checkbox("Enable Audio Features", value=False)
         enable_image = st.checkbox("Enable Resume Image Generation", value=False)
+        use_cache = st.checkbox(
+            "Reuse cached AI responses",
+            value=True,
+            help="Serve repeat analyses of the same resume and job description from the response cache."
+        )
         
         if st.button("🗑️ Clear Cache"):
             st.cache_data.clear()
+            get_extraction_cache().clear()
             st.rerun()
     
     st.title("🚀 AI Resume Enhancer")
+    
+    if page == "History & Insights":
+        display_history(session_manager)
+        display_insights(session_manager)
+        return
+    
     st.write("Get professional feedback on your resume using advanced AI analysis.")
     
     uploaded_file = st.file_uploader(
@@ -150,6 +309,11 @@ def main():
         help="Upload your resume to get detailed feedback and suggestions."
     )
     
+    lineage_id = st.text_input(
+        "Resume name (optional)",
+        help="Analyses saved under the same name are grouped as versions of one resume in the history."
+    ).strip() or None
+    
     job_description = None
     if include_job:
         job_description = st.text_area(
@@ -161,11 +325,11 @@ def main():
     # Main analysis
     if uploaded_file:
         try:
-            # Extract text
-            if uploaded_file.name.endswith(".pdf"):
-                resume_text = extract_text_from_pdf(uploaded_file)
-            else:
-                resume_text = extract_text_from_docx(uploaded_file)
+            # Extract text (cached by file digest across reruns and sessions)
+            extracted = extract_cached(uploaded_file)
+            resume_text = extracted.text
+            if extracted.truncated:
+                st.warning(f"⚠️ {extracted.truncated}. The analysis below only covers those pages.")
             
             # Display resume text
             with st.expander("📄 View Resume Text", expanded=False):
@@ -177,10 +341,19 @@ def main():
                 )
             
             # Get AI analysis
-            if st.button("🧠 Analyze Resume", use_container_width=True):
-                with st.spinner("Analyzing your resume..."):
+            resume_key = fingerprint(resume_text)
+            analyze_clicked = st.button("🧠 Analyze Resume", use_container_width=True)
+            if analyze_clicked:
+                st.session_state.analyzed_resume = resume_key
+            
+            # Results stay up across reruns (e.g. the buttons below); each
+            # rerun only recomputes the stages whose inputs changed
+            if st.session_state.get('analyzed_resume') == resume_key:
+                pipeline = get_session_pipeline()
+                with st.container(), span('analyze_request'):
                     try:
-                        results = get_ai_feedback(resume_text, job_description)
+                        # Deterministic analysis renders before the model call starts
+                        results = analyze_resume(resume_text, job_description, pipeline=pipeline)
                         
                         # Display scores
                         st.subheader("� Resume Scores")
@@ -197,26 +370,44 @@ def main():
                         # Display AI suggestions with modification capability
                         st.subheader("💡 AI Recommendations")
                         
-                        # Allow user to modify AI suggestions
-                        modified_suggestions = st.text_area(
-                            "Review and modify the AI suggestions below:",
-                            value=results['ai_suggestions'],
-                            height=300,
-                            help="You can edit these suggestions to better match your needs. The changes will be saved in the analysis history."
-                        )
+                        # The model is only called on an explicit click. Other
+                        # reruns (a job description edit, the buttons below)
+                        # recompute the panels above and reuse a recorded answer.
+                        inputs = pipeline_inputs(resume_text, job_description)
+                        refresh_feedback = analyze_clicked
+                        generate = analyze_clicked or ('ai_suggestions', inputs) in pipeline
+                        if not generate:
+                            st.info("The inputs changed since the AI feedback was generated.")
+                            refresh_feedback = generate = st.button("🔁 Re-run AI feedback")
+                        if generate:
+                            # Stream the model's answer into the panel as it arrives.
+                            # With the response cache off, each click asks the
+                            # model again; other reruns keep the answer shown.
+                            prompt = pipeline.run(inputs, ('prompt',))['prompt']
+                            results['prompt_stats'] = prompt_stats(prompt)
+                            timings = {}
+                            initialize_gemini()
+                            results['ai_suggestions'] = st.write_stream(stream_pipeline_suggestions(
+                                pipeline, resume_text, job_description, use_cache=use_cache, timings=timings,
+                                refresh=refresh_feedback and not use_cache
+                            ))
+                            results['timings'] = timings
+                            display_generation_timings(timings, results['prompt_stats'])
                         
-                        # Add buttons for suggestion modification
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            if st.button("✅ Accept Modifications"):
-                                results['ai_suggestions'] = modified_suggestions
-                                session_manager.add_to_history(resume_text, results, job_description)
-                                st.success("Modifications saved! Your customized feedback has been stored.")
-                        with col2:
-                            if st.button("🔄 Reset to Original"):
-                                st.rerun()
-                        with col3:
-                            if st.button("📝 Add Custom Note"):
+                            # Allow user to modify AI suggestions; edits are kept
+                            # until the suggestions themselves change
+                            edit_key = f"modified_suggestions_{fingerprint(results['ai_suggestions'])[:16]}"
+                            modified_suggestions = st.text_area(
+                                "Review and modify the AI suggestions below:",
+                                value=results['ai_suggestions'],
+                                height=300,
+                                key=edit_key,
+                                help="You can edit these suggestions to better match your needs. The changes will be saved in the analysis history."
+                            )
+                        
+                            # A checkbox rather than a button, so the note field
+                            # stays open on the rerun its input triggers
+                            if st.checkbox("📝 Add Custom Note"):
                                 custom_note = st.text_area(
                                     "Add your custom note:",
                                     height=100,
@@ -224,61 +415,64 @@ def main():
                                 )
                                 if custom_note:
                                     modified_suggestions += f"\n\n📌 Custom Notes:\n{custom_note}"
+                        
+                            # Add buttons for suggestion modification
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                if st.button("✅ Accept Modifications"):
                                     results['ai_suggestions'] = modified_suggestions
+                                    session_manager.add_to_history(resume_text, results, job_description, lineage_id=lineage_id)
+                                    st.success("Modifications saved! Your customized feedback has been stored.")
+                            with col2:
+                                if st.button("🔄 Reset to Original"):
+                                    del st.session_state[edit_key]
+                                    st.rerun()
                         
-                        # Success message
-                        st.success("Analysis complete! Review, modify, and save the feedback above to improve your resume.")
+                            # Success message
+                            st.success("Analysis complete! Review, modify, and save the feedback above to improve your resume.")
                         
-                        # Audio features
-                        if enable_audio:
-                            st.subheader("🎤 Audio Features")
-                            # Text-to-speech for feedback
-                            if st.button("🔊 Listen to Feedback"):
-                                try:
-                                    audio_file = speech_handler.text_to_speech(results['ai_suggestions'])
-                                    st.audio(audio_file)
-                                    speech_handler.cleanup_audio_file(audio_file)
-                                except Exception as e:
-                                    st.error(f"Error generating audio: {str(e)}")
+                            # Audio features
+                            if enable_audio:
+                                st.subheader("🎤 Audio Features")
+                                # Text-to-speech for feedback
+                                if st.button("🔊 Listen to Feedback"):
+                                    try:
+                                        # One player per chunk, shown as soon as that chunk is synthesized
+                                        for part in get_speech_handler().iter_speech(results['ai_suggestions']):
+                                            st.audio(part, format="audio/mp3")
+                                    except Exception as e:
+                                        st.error(f"Error generating audio: {str(e)}")
                             
-                            # Speech input for job description
-                            st.write("🎙️ Or describe the job requirements verbally:")
-                            audio_file = st.file_uploader("Upload audio file (WAV format)", type=['wav'])
-                            if audio_file:
-                                try:
-                                    text = speech_handler.speech_to_text(audio_file)
-                                    st.text_area("Transcribed Text", text, height=100)
-                                except Exception as e:
-                                    st.error(f"Error processing audio: {str(e)}")
+                                # Speech input for job description
+                                st.write("🎙️ Or describe the job requirements verbally:")
+                                audio_file = st.file_uploader("Upload audio file (WAV format)", type=['wav'])
+                                if audio_file:
+                                    try:
+                                        # Show the transcript growing window by window
+                                        partial = st.empty()
+                                        text = ""
+                                        for text in get_speech_handler().iter_partial_transcripts(audio_file):
+                                            partial.caption(f"Transcribing… {text}")
+                                        partial.empty()
+                                        st.text_area("Transcribed Text", text, height=100)
+                                    except Exception as e:
+                                        st.error(f"Error processing audio: {str(e)}")
                         
                         # Resume image generation
                         if enable_image:
                             st.subheader("🖼️ Resume Visualization")
                             try:
-                                # Convert resume sections to structured data
-                                resume_data = {
-                                    'summary': results.get('section_analysis', {}).get('summary', {}).get('content', ''),
-                                    'experience': results.get('section_analysis', {}).get('experience', {}).get('content', ''),
-                                    'education': results.get('section_analysis', {}).get('education', {}).get('content', ''),
-                                    'skills': results.get('section_analysis', {}).get('skills', {}).get('content', ''),
-                                    'personal_info': {
-                                        'name': 'Your Name',  # This should be extracted from the resume
-                                        'email': 'email@example.com',
-                                        'phone': '(123) 456-7890',
-                                        'location': 'City, State'
-                                    }
-                                }
+                                # Structured data read from the cached section index
+                                resume_data = build_resume_data(resume_text)
                                 
                                 if st.button("📄 Generate Resume Image"):
-                                    image_path = image_generator.create_resume_image(resume_data)
-                                    with open(image_path, "rb") as file:
-                                        st.download_button(
-                                            label="⬇️ Download Resume Image",
-                                            data=file,
-                                            file_name="enhanced_resume.pdf",
-                                            mime="application/pdf"
-                                        )
-                                    image_generator.cleanup_image_file(image_path)
+                                    # Rendered in memory and handed straight to the download
+                                    st.download_button(
+                                        label="⬇️ Download Resume Image",
+                                        data=get_image_generator().render_resume(resume_data),
+                                        file_name="enhanced_resume.pdf",
+                                        mime="application/pdf"
+                                    )
                             except Exception as e:
                                 st.error(f"Error generating resume image: {str(e)}")
                         
@@ -0,0 +1,353 @@
+"""
+Headless JSON scoring service.
+
+    GEMINI_API_KEY=... python -m src.service --port 8080 --workers 4
+
+POST /v1/analyze takes either JSON::
+
+    {"resume_text": "...", "job_description": "...", "feedback": false}
+    {"resume_base64": "...", "filename": "cv.pdf", "job_description": "..."}
+
+or multipart/form-data with a ``resume`` file and optional
+``job_description`` and ``feedback`` fields. It returns scores, keyword
+matches and section analysis, plus ``ai_suggestions`` when feedback is
+requested; without ``--api-key`` or ``GEMINI_API_KEY`` at startup,
+feedback requests get 501. ``truncated`` says why pages of a long PDF were
+left out, and is null when the whole file was read. GET /health reports
+queue depth; GET /metrics serves the process's metrics in Prometheus text
+format.
+
+Extraction and scoring spans (``extract_pdf``, ``resume_scores``...) are
+recorded inside the worker processes and do not appear in /metrics. The
+service process records ``service_request`` and ``service_analysis``
+(queue wait plus worker time) per request, and the model-call spans of
+feedback requests.
+
+Extraction and scoring run on a process pool. At most ``queue_size``
+analyses may be waiting for or running on it, including ones whose
+request already timed out with 504; beyond that, and beyond
+``llm_concurrency`` concurrent model calls, requests get 503 with
+Retry-After instead of piling up.
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import fitz
+from docx.opc.exceptions import PackageNotFoundError
+
+from .utils.ai_feedback import (
+    analyze_resume,
+    build_feedback_prompt,
+    generate_suggestions,
+    initialize_gemini,
+    prompt_stats
+)
+from .utils.metrics import get_registry, span
+from .utils.text_extractor import (
+    MAX_PDF_BYTES,
+    ExtractedText,
+    ExtractionLimitError,
+    extract_text_from_docx,
+    read_pdf_text
+)
+
+MAX_REQUEST_BYTES = MAX_PDF_BYTES + 1024 * 1024
+DEFAULT_WORKERS = os.cpu_count() or 2
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_LLM_CONCURRENCY = 4
+REQUEST_TIMEOUT = 60.0
+RETRY_AFTER_SECONDS = 2
+
+class RequestError(Exception):
+    """A client error, reported with ``status`` and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class UnsupportedFileError(ValueError):
+    """The uploaded file is neither a PDF nor a DOCX."""
+
+class UnreadableFileError(ValueError):
+    """The uploaded file is not a valid PDF or DOCX."""
+
+def extract_text(data: bytes, filename: str) -> ExtractedText:
+    name = filename.lower()
+    try:
+        if name.endswith('.pdf'):
+            return read_pdf_text(io.BytesIO(data))
+        if name.endswith('.docx'):
+            return ExtractedText(extract_text_from_docx(io.BytesIO(data)))
+    except (fitz.FileDataError, zipfile.BadZipFile, PackageNotFoundError):
+        # The parser's message names the server's temporary file
+        kind = name.rsplit('.', 1)[1].upper()
+        raise UnreadableFileError(f"Could not read {filename} as a {kind} file") from None
+    raise UnsupportedFileError(f"Unsupported file type: {filename}")
+
+def analyze_document(resume_text: Optional[str],
+                     file_data: Optional[bytes],
+                     filename: str,
+                     job_description: Optional[str]) -> Dict:
+    """Deterministic analysis; runs in a worker process."""
+    truncated = None
+    if resume_text is None:
+        resume_text, truncated = extract_text(file_data, filename)
+    result = analyze_resume(resume_text, job_description)
+    result['characters'] = len(resume_text)
+    result['truncated'] = truncated
+    result['resume_text'] = resume_text
+    return result
+
+class ScoringService:
+    """Bounded front end to a worker pool, shared by the request threads."""
+
+    def __init__(self,
+                 workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+                 timeout: float = REQUEST_TIMEOUT,
+                 executor: Optional[Executor] = None,
+                 api_key: Optional[str] = None):
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers)
+        # Feedback needs a key given up front; Streamlit secrets are never read
+        self.api_key = api_key
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._llm_slots = threading.BoundedSemaphore(llm_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._pending = set()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _finished(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._pending.discard(future)
+        self._slots.release()
+
+    def analyze(self,
+                resume_text: Optional[str] = None,
+                file_data: Optional[bytes] = None,
+                filename: str = '',
+                job_description: Optional[str] = None,
+                feedback: bool = False) -> Dict:
+        if feedback and not self.api_key:
+            raise RequestError(501, "AI feedback is not configured on this server")
+        if not self._slots.acquire(blocking=False):
+            raise RequestError(503, "Server busy, retry later")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self.executor.submit(analyze_document, resume_text, file_data, filename, job_description)
+        except BaseException:
+            self._finished(None)
+            raise
+        with self._lock:
+            self._pending.add(future)
+        # The slot is freed when the work ends, not when this request stops
+        # waiting: a running task cannot be cancelled and still holds a worker.
+        future.add_done_callback(self._finished)
+        try:
+            # Stages inside the worker are recorded in its own registry;
+            # this span covers the queue wait and the work as seen from here
+            with span('service_analysis'):
+                result = future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise RequestError(504, "Analysis timed out")
+
+        resume_text = result.pop('resume_text')
+        if feedback:
+            if not self._llm_slots.acquire(blocking=False):
+                raise RequestError(503, "Too many feedback requests, retry later")
+            try:
+                built = build_feedback_prompt(resume_text, job_description, result)
+                result['prompt_stats'] = prompt_stats(built)
+                initialize_gemini(self.api_key)
+                timings = {}
+                result['ai_suggestions'] = generate_suggestions(built.prompt, timings=timings)
+                result['timings'] = timings
+            finally:
+                self._llm_slots.release()
+        return result
+
+    def shutdown(self) -> None:
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self.executor.shutdown(wait=False)
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+def parse_json_request(body: bytes) -> Dict:
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise RequestError(400, "Body is not valid JSON")
+    if not isinstance(data, dict):
+        raise RequestError(400, "Expected a JSON object")
+    for field in ('resume_text', 'resume_base64', 'filename', 'job_description'):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            raise RequestError(400, f"'{field}' must be a string")
+    request = {
+        'resume_text': data.get('resume_text'),
+        'file_data': None,
+        'filename': data.get('filename') or '',
+        'job_description': data.get('job_description') or None,
+        'feedback': _truthy(data.get('feedback', False)),
+    }
+    if request['resume_text'] is None:
+        if data.get('resume_base64') is None:
+            raise RequestError(400, "Provide resume_text or resume_base64 with filename")
+        try:
+            request['file_data'] = base64.b64decode(data['resume_base64'], validate=True)
+        except ValueError:
+            raise RequestError(400, "resume_base64 is not valid base64")
+    return request
+
+def parse_multipart_request(content_type: str, body: bytes) -> Dict:
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+    )
+    if not message.is_multipart():
+        raise RequestError(400, "Malformed multipart body")
+    fields: Dict[str, Tuple[Optional[str], bytes]] = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b'')
+    if 'resume' not in fields:
+        raise RequestError(400, "Missing 'resume' file field")
+    filename, data = fields['resume']
+    job = fields.get('job_description', (None, b''))[1].decode('utf-8', 'replace')
+    return {
+        'resume_text': None if filename else data.decode('utf-8', 'replace'),
+        'file_data': data if filename else None,
+        'filename': filename or '',
+        'job_description': job or None,
+        'feedback': _truthy(fields.get('feedback', (None, b''))[1].decode('utf-8', 'replace')),
+    }
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service: ScoringService = None
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status: int, payload, content_type: str = 'application/json') -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 503:
+            self.send_header('Retry-After', str(RETRY_AFTER_SECONDS))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self._send(200, {
+                'status': 'ok',
+                'in_flight': self.service.in_flight,
+                'queue_size': self.service.queue_size,
+                'feedback': bool(self.service.api_key),
+            })
+        elif path == '/metrics':
+            self._send(200, get_registry().to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+        else:
+            self._send(404, {'error': "Not found"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/v1/analyze':
+            self._send(404, {'error': "Not found"})
+            return
+        try:
+            with span('service_request'):
+                self._send(200, self.service.analyze(**self._read_request()))
+        except RequestError as e:
+            self._send(e.status, {'error': str(e)})
+        except (ExtractionLimitError, UnsupportedFileError, UnreadableFileError) as e:
+            self._send(422, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': f"Error during analysis: {str(e)}"})
+
+    def _read_request(self) -> Dict:
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            raise RequestError(411, "Content-Length required")
+        if length <= 0:
+            # rfile.read(-1) would block until the client closes the socket
+            self.close_connection = True
+            raise RequestError(400, "Content-Length must be a positive number of bytes")
+        if length > MAX_REQUEST_BYTES:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            raise RequestError(413, f"Request larger than {MAX_REQUEST_BYTES} bytes")
+        body = self.rfile.read(length)
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            return parse_json_request(body)
+        if content_type.startswith('multipart/form-data'):
+            return parse_multipart_request(content_type, body)
+        raise RequestError(415, "Use application/json or multipart/form-data")
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(service: ScoringService, host: str = '127.0.0.1', port: int = 8080) -> ThreadingHTTPServer:
+    handler = type('BoundServiceHandler', (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless resume scoring service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="worker processes")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="requests admitted before answering 503")
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="concurrent feedback requests")
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT)
+    parser.add_argument('--api-key', default=os.environ.get('GEMINI_API_KEY'),
+                        help="Gemini API key for feedback requests (default: $GEMINI_API_KEY)")
+    args = parser.parse_args()
+
+    service = ScoringService(args.workers, args.queue_size, args.llm_concurrency, args.timeout,
+                             api_key=args.api_key)
+    if not args.api_key:
+        print("No Gemini API key: feedback requests will get 501")
+    server = make_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+if __name__ == '__main__':
+    main()
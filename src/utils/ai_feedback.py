@@ -1,73 +1,234 @@
-import google.generativeai as genai
-import streamlit as st
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
 from .resume_analyzer import (
     calculate_resume_scores,
     calculate_keyword_match,
+    keyword_match_score,
     analyze_resume_sections
 )
+from .llm_client import AsyncLLMClient, GeminiBackend, RateLimiter, iter_sync
+from .metrics import get_registry, increment, record_size, span
+from .pipeline import MAX_PIPELINE_ENTRIES, Pipeline, Stage
+from .prompt_builder import BuiltPrompt, build_prompt
+from .response_cache import ResponseCache, cache_key
 
-def initialize_gemini():
-    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+MODEL_NAME = 'gemini-2.5-flash-lite'
 
-def get_ai_feedback(resume_text: str, job_description: str = None) -> dict:
-    # Calculate various scores
-    scores = calculate_resume_scores(resume_text, job_description)
-    
+# Stages whose results make up ``analyze_resume``'s output
+ANALYSIS_STAGES = ('scores', 'keyword_matches', 'section_analysis')
+
+_response_cache = None
+_llm_client = None
+_pipeline = None
+_gemini_configured = False
+_gemini_lock = threading.Lock()
+
+def initialize_gemini(api_key: Optional[str] = None):
+    """Configure the Gemini SDK once per process.
+
+    The key is ``api_key``, else the ``GEMINI_API_KEY`` environment variable,
+    else Streamlit's secrets; Streamlit is only imported for that last case,
+    so headless callers never need it. The SDK is imported here rather than
+    at module load, so reruns and cache hits never pay for it.
+    """
+    global _gemini_configured
+    with _gemini_lock:
+        if _gemini_configured:
+            return
+        api_key = api_key or os.environ.get('GEMINI_API_KEY')
+        if not api_key:
+            import streamlit as st
+            api_key = st.secrets["GEMINI_API_KEY"]
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        _gemini_configured = True
+
+def get_llm_client() -> AsyncLLMClient:
+    """Process-wide client; the Gemini model instance and limits are shared."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = AsyncLLMClient(
+            GeminiBackend(MODEL_NAME),
+            RateLimiter(
+                requests_per_minute=float(os.environ.get('GEMINI_RPM', 15)),
+                tokens_per_minute=float(os.environ.get('GEMINI_TPM', 250_000)),
+            ),
+        )
+    return _llm_client
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+@span('llm_generate')
+def stream_suggestions(prompt: str,
+                       use_cache: bool = True,
+                       timings: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """Yield the model's answer chunk by chunk.
+
+    A cached answer is yielded as one chunk. If ``timings`` is given it is
+    filled with ``time_to_first_token`` and ``total_time`` in seconds and
+    ``cached``.
+    """
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+    cache = get_response_cache()
+    use_cache = use_cache and cache.enabled
+    key = cache_key(MODEL_NAME, prompt)
+
+    cached = cache.get(key) if use_cache else None
+    if cached is not None:
+        increment('response_cache_hits')
+        timings.update(cached=True, time_to_first_token=time.perf_counter() - started)
+        yield cached
+        timings['total_time'] = time.perf_counter() - started
+        return
+
+    increment('response_cache_misses')
+    timings['cached'] = False
+    chunks = []
+    for text in iter_sync(get_llm_client().stream(prompt)):
+        if not chunks:
+            timings['time_to_first_token'] = time.perf_counter() - started
+        chunks.append(text)
+        yield text
+    timings['total_time'] = time.perf_counter() - started
+    response = ''.join(chunks)
+    get_registry().observe_duration(
+        'llm_time_to_first_token', timings.get('time_to_first_token', timings['total_time'])
+    )
+    record_size('response_chars', len(response))
+
+    if use_cache:
+        cache.set(key, response)
+
+def generate_suggestions(prompt: str,
+                         use_cache: bool = True,
+                         timings: Optional[Dict[str, float]] = None) -> str:
+    return ''.join(stream_suggestions(prompt, use_cache, timings))
+
+def _keyword_matches(resume_text: str, job_description: Optional[str]) -> dict:
     # Get keyword matches if job description is provided
-    keyword_matches = {}
-    if job_description:
-        matched, missing = calculate_keyword_match(resume_text, job_description)
-        keyword_matches = {
-            'matched': matched,
-            'missing': missing
-        }
-    
-    # Analyze resume sections
-    section_analysis = analyze_resume_sections(resume_text)
-    
-    # Get AI suggestions
-    model = genai.GenerativeModel(model_name='gemini-2.5-flash-lite')
-    
-    # Create a detailed prompt based on analysis
-    prompt = f"""
-    As an expert career advisor, provide specific suggestions to improve this resume.
-    
-    Current Scores:
-    - Readability: {scores.get('readability')}%
-    - Formatting: {scores.get('formatting')}%
-    - Content: {scores.get('content')}%
-    {f"- Keyword Match: {scores.get('keyword_match')}%" if 'keyword_match' in scores else ""}
-    
-    Areas to focus on:
-    1. Summary Section:
-    {section_analysis['summary']['suggestions']}
-    
-    2. Experience Section:
-    {section_analysis['experience']['suggestions']}
-    
-    3. Education Section:
-    {section_analysis['education']['suggestions']}
-    
-    4. Skills Section:
-    {section_analysis['skills']['suggestions']}
-    
-    Original Resume:
-    {resume_text}
-    
-    {f"Job Description:\\n{job_description}" if job_description else ""}
-    
-    Provide specific, actionable improvements for:
-    1. Making the resume more ATS-friendly
-    2. Strengthening achievement descriptions
-    3. Improving overall impact and readability
-    4. Optimizing format and structure
+    if not job_description:
+        return {}
+    matched, missing = calculate_keyword_match(resume_text, job_description)
+    return {
+        'matched': matched,
+        'missing': missing
+    }
+
+def _combine_scores(document_scores: dict, keyword_matches: dict) -> dict:
+    scores = dict(document_scores)
+    if keyword_matches:
+        scores['keyword_match'] = keyword_match_score(keyword_matches['matched'], keyword_matches['missing'])
+    return scores
+
+def _prompt_stage(resume_text, job_description, scores, section_analysis) -> BuiltPrompt:
+    return build_feedback_prompt(
+        resume_text,
+        job_description,
+        {'scores': scores, 'section_analysis': section_analysis}
+    )
+
+def build_analysis_pipeline(max_entries: int = MAX_PIPELINE_ENTRIES) -> Pipeline:
+    """Analysis stages over ``resume_text`` and ``job_description``.
+
+    Resume-only stages (document scores, sections) keep their results when
+    only the job description changes; keyword matching, the combined scores,
+    the prompt and the model's answer are recomputed.
     """
-    
-    response = model.generate_content(prompt)
-    
+    return Pipeline([
+        Stage('document_scores', calculate_resume_scores, ('resume_text',)),
+        Stage('keyword_matches', _keyword_matches, ('resume_text', 'job_description')),
+        Stage('scores', _combine_scores, ('document_scores', 'keyword_matches')),
+        Stage('section_analysis', analyze_resume_sections, ('resume_text',)),
+        Stage('prompt', _prompt_stage, ('resume_text', 'job_description', 'scores', 'section_analysis')),
+        # Streamed by the caller and recorded with Pipeline.store
+        Stage('ai_suggestions', None, ('prompt',)),
+    ], max_entries=max_entries)
+
+def get_analysis_pipeline() -> Pipeline:
+    """Process-wide pipeline for callers without a session of their own."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = build_analysis_pipeline()
+    return _pipeline
+
+def pipeline_inputs(resume_text: str, job_description: Optional[str] = None) -> Dict[str, Optional[str]]:
+    # An empty job description is the same input as none at all
+    return {'resume_text': resume_text, 'job_description': job_description or None}
+
+def analyze_resume(resume_text: str,
+                   job_description: str = None,
+                   pipeline: Optional[Pipeline] = None) -> dict:
+    """Deterministic part of the analysis; no model call."""
+    pipeline = pipeline or get_analysis_pipeline()
+    values = pipeline.run(pipeline_inputs(resume_text, job_description), ANALYSIS_STAGES)
+    return {name: values[name] for name in ANALYSIS_STAGES}
+
+def stream_pipeline_suggestions(pipeline: Pipeline,
+                                resume_text: str,
+                                job_description: Optional[str],
+                                use_cache: bool = True,
+                                timings: Optional[Dict[str, float]] = None,
+                                refresh: bool = False) -> Iterator[str]:
+    """Stream the model's answer for the pipeline's prompt stage.
+
+    An answer already recorded for the same inputs is yielded at once unless
+    ``refresh`` is set; otherwise the streamed answer is recorded once it
+    completes. ``use_cache`` applies to the persistent response cache.
+    """
+    timings = timings if timings is not None else {}
+    inputs = pipeline_inputs(resume_text, job_description)
+    if not refresh:
+        recorded = pipeline.lookup('ai_suggestions', inputs)
+        if recorded is not None:
+            timings.update(cached=True, time_to_first_token=0.0, total_time=0.0)
+            yield recorded
+            return
+    built = pipeline.run(inputs, ('prompt',))['prompt']
+    chunks = []
+    for text in stream_suggestions(built.prompt, use_cache, timings):
+        chunks.append(text)
+        yield text
+    pipeline.store('ai_suggestions', inputs, ''.join(chunks))
+
+@span('build_prompt')
+def build_feedback_prompt(resume_text: str,
+                          job_description: str,
+                          analysis: dict,
+                          token_budget: Optional[int] = None) -> BuiltPrompt:
+    """Compacted prompt within the token budget; see prompt_builder."""
+    built = build_prompt(resume_text, job_description, analysis, token_budget)
+    record_size('prompt_tokens', built.tokens)
+    record_size('prompt_chars', len(built.prompt))
+    return built
+
+def prompt_stats(built: BuiltPrompt) -> Dict[str, int]:
     return {
-        'scores': scores,
-        'keyword_matches': keyword_matches,
-        'section_analysis': section_analysis,
-        'ai_suggestions': response.text
-    }
\ No newline at end of file
+        'prompt_tokens': built.tokens,
+        'original_tokens': built.original_tokens,
+        'tokens_saved': built.tokens_saved
+    }
+
+def get_ai_feedback(resume_text: str,
+                    job_description: str = None,
+                    use_cache: bool = True,
+                    pipeline: Optional[Pipeline] = None) -> dict:
+    pipeline = pipeline or get_analysis_pipeline()
+    values = pipeline.run(pipeline_inputs(resume_text, job_description), ANALYSIS_STAGES + ('prompt',))
+    analysis = {name: values[name] for name in ANALYSIS_STAGES}
+    analysis['prompt_stats'] = prompt_stats(values['prompt'])
+    
+    # Identical prompts are served from the persistent response cache
+    timings = {}
+    analysis['ai_suggestions'] = ''.join(stream_pipeline_suggestions(
+        pipeline, resume_text, job_description, use_cache, timings, refresh=not use_cache
+    ))
+    analysis['timings'] = timings
+    return analysis
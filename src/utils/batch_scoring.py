@@ -0,0 +1,112 @@
+"""Bulk resume scoring across a process pool, streamed out as JSONL."""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+from .resume_analyzer import calculate_keyword_match, calculate_resume_scores
+from .text_extractor import extract_text_from_docx, extract_text_from_pdf
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+def collect_resume_files(sources: Iterable[str]) -> List[str]:
+    """Expand directories (non-recursively) and keep PDF/DOCX files only."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(
+                os.path.join(source, name) for name in sorted(os.listdir(source))
+            )
+        else:
+            paths.append(source)
+    return [
+        path for path in paths
+        if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+    ]
+
+def extract_text_from_path(path: str) -> str:
+    if path.lower().endswith('.pdf'):
+        return extract_text_from_pdf(path)
+    with open(path, 'rb') as fh:
+        return extract_text_from_docx(fh)
+
+def score_resume_file(path: str, job_description: Optional[str] = None) -> Dict:
+    record = {'file': path}
+    try:
+        resume_text = extract_text_from_path(path)
+        record['characters'] = len(resume_text)
+        # Keyword matching runs once and feeds both the score and the report
+        keyword_match = calculate_keyword_match(resume_text, job_description) if job_description else None
+        record['scores'] = calculate_resume_scores(resume_text, job_description, keyword_match)
+        if keyword_match:
+            matched, missing = keyword_match
+            record['keyword_matches'] = {'matched': matched, 'missing': missing}
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+def score_resumes(sources: Iterable[str],
+                  job_description: Optional[str] = None,
+                  workers: Optional[int] = None,
+                  ordered: bool = True) -> Iterator[Dict]:
+    """Yield one result dict per resume file.
+
+    ``workers=1`` scores in-process; otherwise files are spread over a process
+    pool. With ``ordered=False`` results are yielded as soon as they finish.
+    """
+    paths = collect_resume_files(sources)
+    score = partial(score_resume_file, job_description=job_description)
+    if workers == 1 or len(paths) <= 1:
+        yield from map(score, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            yield from pool.map(score, paths, chunksize=4)
+        else:
+            futures = [pool.submit(score, path) for path in paths]
+            for future in as_completed(futures):
+                yield future.result()
+
+def write_jsonl(records: Iterable[Dict], out: IO[str]) -> int:
+    count = 0
+    for record in records:
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+        count += 1
+    return count
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Score resumes in bulk against one job description."
+    )
+    parser.add_argument('paths', nargs='+', help="Resume files or directories")
+    jd_group = parser.add_mutually_exclusive_group()
+    jd_group.add_argument('--job-description', help="Job description text")
+    jd_group.add_argument('--job-file', help="File containing the job description")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Process pool size (default: CPU count)")
+    parser.add_argument('--output', help="JSONL output file (default: stdout)")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Emit results as they complete")
+    args = parser.parse_args(argv)
+
+    job_description = args.job_description
+    if args.job_file:
+        with open(args.job_file, encoding='utf-8') as fh:
+            job_description = fh.read()
+
+    records = score_resumes(args.paths, job_description, args.workers,
+                            ordered=not args.unordered)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            write_jsonl(records, out)
+    else:
+        write_jsonl(records, sys.stdout)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
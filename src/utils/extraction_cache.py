@@ -0,0 +1,183 @@
+"""Extraction cache keyed by a SHA-256 of the uploaded file's bytes."""
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Optional
+
+from .text_extractor import (
+    ExtractedText,
+    ExtractionTruncatedWarning,
+    extract_text_from_docx,
+    read_pdf_text
+)
+
+_READ_CHUNK = 1024 * 1024
+
+def file_digest(file) -> str:
+    """SHA-256 of a path or binary file-like object; streams are rewound."""
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(_READ_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(_READ_CHUNK), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """Per-process LRU of extracted text, optionally backed by a directory.
+
+    Each entry holds the text together with the reason a PDF was cut short,
+    if it was. The memory tier is bounded by the UTF-8 size of the cached
+    text; the disk tier evicts the least recently used files (by mtime) once
+    their total size exceeds ``max_disk_bytes``.
+    """
+
+    def __init__(self,
+                 max_memory_bytes: int = 32 * 1024 * 1024,
+                 disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key.replace(':', '-') + '.json')
+
+    def _remember(self, key: str, extracted: ExtractedText) -> None:
+        size = len(extracted.text.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = (extracted, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    def get_extracted(self, key: str) -> Optional[ExtractedText]:
+        """The cached text and truncation reason for ``key``, if any."""
+        extracted = None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                extracted = entry[0]
+        if extracted is None and self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    data = json.load(fh)
+                os.utime(path)
+            except (OSError, ValueError):
+                pass
+            else:
+                extracted = ExtractedText(data['text'], data.get('truncated'))
+                self._remember(key, extracted)
+        if extracted is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return extracted
+
+    def get(self, key: str) -> Optional[str]:
+        extracted = self.get_extracted(key)
+        return extracted.text if extracted is not None else None
+
+    def set(self, key: str, text: str, truncated: Optional[str] = None) -> None:
+        extracted = ExtractedText(text, truncated)
+        self._remember(key, extracted)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump(extracted._asdict(), fh)
+            os.replace(tmp, path)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_extraction_cache() -> ExtractionCache:
+    """Process-wide cache; set RESUME_ENHANCER_EXTRACTION_CACHE_DIR to persist it."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache(
+                disk_dir=os.environ.get('RESUME_ENHANCER_EXTRACTION_CACHE_DIR') or None
+            )
+        return _cache
+
+def extract_cached(file, name: Optional[str] = None,
+                   cache: Optional[ExtractionCache] = None) -> ExtractedText:
+    """Extract text from a PDF/DOCX upload or path, reusing earlier results.
+
+    The type comes from ``name`` (or ``file.name``/the path); identical bytes
+    uploaded again, in any session, hit the cache. The reason a PDF was cut
+    short by a page or time limit is cached with its text.
+    """
+    cache = cache or get_extraction_cache()
+    if name is None:
+        name = file if isinstance(file, (str, os.PathLike)) else getattr(file, 'name', '')
+    kind = 'pdf' if str(name).lower().endswith('.pdf') else 'docx'
+    key = f"{kind}:{file_digest(file)}"
+
+    extracted = cache.get_extracted(key)
+    if extracted is not None:
+        return extracted
+    if kind == 'pdf':
+        extracted = read_pdf_text(file)
+    elif isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as fh:
+            extracted = ExtractedText(extract_text_from_docx(fh))
+    else:
+        extracted = ExtractedText(extract_text_from_docx(file))
+    cache.set(key, extracted.text, extracted.truncated)
+    return extracted
+
+def extract_text_cached(file, name: Optional[str] = None,
+                        cache: Optional[ExtractionCache] = None) -> str:
+    """Text only, as ``extract_cached``; a truncated PDF issues an
+    ExtractionTruncatedWarning."""
+    extracted = extract_cached(file, name, cache)
+    if extracted.truncated:
+        warnings.warn(extracted.truncated, ExtractionTruncatedWarning, stacklevel=2)
+    return extracted.text
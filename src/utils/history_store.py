@@ -0,0 +1,145 @@
+"""Bounded session history with interned, compressed text bodies."""
+import hashlib
+import json
+import zlib
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+MAX_HISTORY_ENTRIES = 50
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+class HistoryStore:
+    """Analysis history that stores each distinct body once.
+
+    Resume texts, job descriptions and serialized analysis results are
+    interned by content hash, zlib-compressed and reference counted, so
+    re-analysing the same resume against several jobs costs one copy of the
+    resume. At most ``max_entries`` entries are kept; the oldest are evicted
+    and their bodies released.
+
+    Entries are grouped into lineages: versions of one resume, identified by
+    a caller-assigned lineage id or, failing that, the resume's content hash.
+    The newest entry of each lineage is tracked in a dict, so saving and
+    grouping never scan the history.
+    """
+
+    def __init__(self, max_entries: int = MAX_HISTORY_ENTRIES):
+        self.max_entries = max_entries
+        self._blobs: Dict[str, list] = {}
+        self._entries: 'OrderedDict[int, Dict]' = OrderedDict()
+        self._next_id = 0
+        self._lineages: Dict[str, deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _intern(self, text: str) -> str:
+        key = content_hash(text)
+        blob = self._blobs.get(key)
+        if blob is None:
+            raw = text.encode('utf-8', 'surrogatepass')
+            self._blobs[key] = [zlib.compress(raw), 1, len(raw)]
+        else:
+            blob[1] += 1
+        return key
+
+    def _release(self, key: Optional[str]) -> None:
+        if key is None:
+            return
+        blob = self._blobs[key]
+        blob[1] -= 1
+        if blob[1] == 0:
+            del self._blobs[key]
+
+    def _text(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        return zlib.decompress(self._blobs[key][0]).decode('utf-8', 'surrogatepass')
+
+    def add(self,
+            resume_text: str,
+            analysis_results: Dict,
+            job_description: Optional[str] = None,
+            timestamp: str = '',
+            is_modified: bool = False,
+            lineage_id: Optional[str] = None) -> int:
+        entry_id = self._next_id
+        self._next_id += 1
+        resume_key = self._intern(resume_text)
+        lineage = lineage_id or resume_key
+        self._entries[entry_id] = {
+            'timestamp': timestamp,
+            'resume': resume_key,
+            'job_description': self._intern(job_description) if job_description else None,
+            'analysis': self._intern(json.dumps(analysis_results, default=list)),
+            'is_modified': is_modified,
+            'lineage': lineage,
+            'lineage_named': bool(lineage_id),
+        }
+        self._lineages.setdefault(lineage, deque()).append(entry_id)
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+        return entry_id
+
+    def _evict(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        # The globally oldest entry is also the oldest of its lineage.
+        versions = self._lineages[entry['lineage']]
+        versions.popleft()
+        if not versions:
+            del self._lineages[entry['lineage']]
+        for field in ('resume', 'job_description', 'analysis'):
+            self._release(entry[field])
+
+    def entry_ids(self) -> List[int]:
+        return list(self._entries)
+
+    def entry(self, entry_id: int) -> Dict:
+        """Decompressed entry in the shape SessionManager has always returned."""
+        meta = self._entries[entry_id]
+        return {
+            'timestamp': meta['timestamp'],
+            'resume_text': self._text(meta['resume']),
+            'job_description': self._text(meta['job_description']),
+            'analysis_results': json.loads(self._text(meta['analysis'])),
+            'is_modified': meta['is_modified'],
+            'is_latest': self.is_latest(entry_id),
+            'lineage': meta['lineage'],
+            'lineage_named': meta['lineage_named'],
+        }
+
+    def entries(self) -> List[Dict]:
+        return [self.entry(entry_id) for entry_id in self._entries]
+
+    def is_latest(self, entry_id: int) -> bool:
+        return self._lineages[self._entries[entry_id]['lineage']][-1] == entry_id
+
+    def latest_entry_id(self, lineage: str) -> Optional[int]:
+        versions = self._lineages.get(lineage)
+        return versions[-1] if versions else None
+
+    def lineages(self) -> Dict[str, List[int]]:
+        """Entry ids per lineage, oldest first; lineages in order of first save."""
+        return {lineage: list(versions) for lineage, versions in self._lineages.items()}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._blobs.clear()
+        self._lineages.clear()
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """Approximate bytes held, against what uncompressed copies would take."""
+        stored = sum(len(blob[0]) for blob in self._blobs.values())
+        referenced = 0
+        for entry in self._entries.values():
+            for field in ('resume', 'job_description', 'analysis'):
+                if entry[field] is not None:
+                    referenced += self._blobs[entry[field]][2]
+        return {
+            'entries': len(self._entries),
+            'unique_bodies': len(self._blobs),
+            'stored_bytes': stored,
+            'uncompressed_bytes': referenced,
+        }
@@ -1,84 +1,136 @@
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 import tempfile
 
-class ResumeImageGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.custom_style = ParagraphStyle(
+from .metrics import record_size, span
+
+SECTION_ORDER = [
+    'summary', 'experience', 'projects', 'education', 'skills',
+    'certifications', 'awards', 'publications', 'languages', 'volunteering',
+    'interests'
+]
+
+PAGE_LAYOUT = {
+    'pagesize': letter,
+    'rightMargin': 72,
+    'leftMargin': 72,
+    'topMargin': 72,
+    'bottomMargin': 72
+}
+
+@lru_cache(maxsize=1)
+def get_resume_styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles, built once per process and shared by every render."""
+    styles = getSampleStyleSheet()
+    return {
+        'name': ParagraphStyle(
+            'NameStyle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=20
+        ),
+        'heading': styles['Heading2'],
+        'body': ParagraphStyle(
             'CustomStyle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=12,
             leading=14,
             spaceAfter=10
-        )
+        ),
+    }
 
-    def create_resume_image(self, resume_data):
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as fp:
-                pdf_path = fp.name
-            
-            doc = SimpleDocTemplate(
-                pdf_path,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
+def _markup(value) -> str:
+    # Resume text is plain text; escape it for reportlab's paragraph markup.
+    return escape(str(value)).replace('\n', '<br/>')
+
+class ResumeImageGenerator:
+    def __init__(self):
+        styles = get_resume_styles()
+        self.name_style = styles['name']
+        self.heading_style = styles['heading']
+        self.custom_style = styles['body']
+
+    def _build_content(self, resume_data):
+        content = []
+        if 'personal_info' in resume_data:
+            content.append(Paragraph(_markup(resume_data['personal_info']['name']), self.name_style))
+
+            contact_text = "<br/>".join(
+                _markup(resume_data['personal_info'].get(field, ''))
+                for field in ('email', 'phone', 'location')
             )
+            content.append(Paragraph(contact_text, self.custom_style))
+            content.append(Spacer(1, 20))
 
-            content = []
-            if 'personal_info' in resume_data:
-                name_style = ParagraphStyle(
-                    'NameStyle',
-                    parent=self.styles['Heading1'],
-                    fontSize=24,
-                    spaceAfter=20
-                )
-                content.append(Paragraph(resume_data['personal_info']['name'], name_style))
-                
-                contact_text = (
-                    f"{resume_data['personal_info'].get('email', '')}<br/>"
-                    f"{resume_data['personal_info'].get('phone', '')}<br/>"
-                    f"{resume_data['personal_info'].get('location', '')}"
-                )
-                content.append(Paragraph(contact_text, self.custom_style))
-                content.append(Spacer(1, 20))
-
-            sections = ['summary', 'experience', 'education', 'skills']
-            for section in sections:
-                if section in resume_data:
-                    content.append(Paragraph(
-                        section.upper(),
-                        self.styles['Heading2']
-                    ))
-                    content.append(Spacer(1, 10))
-                    if isinstance(resume_data[section], list):
-                        for item in resume_data[section]:
-                            if isinstance(item, dict):
-                                for key, value in item.items():
-                                    content.append(Paragraph(
-                                        f"<b>{key}:</b> {value}",
-                                        self.custom_style
-                                    ))
-                            else:
-                                content.append(Paragraph(str(item), self.custom_style))
-                    else:
-                        content.append(Paragraph(str(resume_data[section]), self.custom_style))
-                    content.append(Spacer(1, 15))
-
-            doc.build(content)
-            return pdf_path
+        for section in SECTION_ORDER:
+            if section in resume_data:
+                content.append(Paragraph(
+                    section.upper(),
+                    self.heading_style
+                ))
+                content.append(Spacer(1, 10))
+                if isinstance(resume_data[section], list):
+                    for item in resume_data[section]:
+                        if isinstance(item, dict):
+                            for key, value in item.items():
+                                content.append(Paragraph(
+                                    f"<b>{_markup(key)}:</b> {_markup(value)}",
+                                    self.custom_style
+                                ))
+                        else:
+                            content.append(Paragraph(_markup(item), self.custom_style))
+                else:
+                    content.append(Paragraph(_markup(resume_data[section]), self.custom_style))
+                content.append(Spacer(1, 15))
+        return content
 
+    @span('render_pdf')
+    def render_resume(self, resume_data) -> bytes:
+        """Render the resume PDF into memory and return its bytes."""
+        try:
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, **PAGE_LAYOUT)
+            doc.build(self._build_content(resume_data))
+            record_size('pdf_bytes', buffer.tell())
+            return buffer.getvalue()
         except Exception as e:
             raise Exception(f"Error generating resume image: {str(e)}")
 
+    def create_resume_image(self, resume_data):
+        """Render to a temporary PDF file and return its path."""
+        pdf_bytes = self.render_resume(resume_data)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as fp:
+            fp.write(pdf_bytes)
+            return fp.name
+
     def cleanup_image_file(self, file_path):
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
-            print(f"Error cleaning up image file: {str(e)}")
\ No newline at end of file
+            print(f"Error cleaning up image file: {str(e)}")
+
+_generator = None
+
+def _render_in_worker(resume_data) -> bytes:
+    # One generator per worker process, reused across its tasks.
+    global _generator
+    if _generator is None:
+        _generator = ResumeImageGenerator()
+    return _generator.render_resume(resume_data)
+
+def render_resumes(resume_data_list: List[Dict], workers: Optional[int] = None) -> List[bytes]:
+    """Render many resumes to PDF bytes, in input order, across a process pool."""
+    if workers == 1 or len(resume_data_list) <= 1:
+        return [_render_in_worker(resume_data) for resume_data in resume_data_list]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_in_worker, resume_data_list, chunksize=4))
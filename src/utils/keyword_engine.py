@@ -0,0 +1,136 @@
+"""Compiled keyword matching over a loadable term taxonomy."""
+import json
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+
+class KeywordMatch(NamedTuple):
+    term: str
+    start: int
+    end: int
+
+
+def normalize_term(term: str) -> str:
+    return ' '.join(term.lower().split())
+
+
+def load_taxonomy(path: str) -> List[str]:
+    """Load terms from a JSON file (list or {category: [terms]}) or a text file
+    with one term per line; blank lines and '#' comments are ignored."""
+    with open(path, encoding='utf-8') as fh:
+        if path.endswith('.json'):
+            data = json.load(fh)
+            if isinstance(data, dict):
+                return [term for terms in data.values() for term in terms]
+            return list(data)
+        return [
+            line.strip() for line in fh
+            if line.strip() and not line.lstrip().startswith('#')
+        ]
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def matching_view(text: str) -> str:
+    # Lowercase with whitespace folded to ' ' while keeping offsets aligned
+    # with the original text, so reported spans can slice it directly.
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+    if not lowered.isprintable():
+        lowered = ''.join(' ' if ch.isspace() else ch for ch in lowered)
+    return lowered
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of terms.
+
+    The automaton is built once; matching is a single pass over the text no
+    matter how many terms the taxonomy holds. Terms may span several words
+    ('machine learning') or contain punctuation ('ci/cd'), and matches are
+    only reported on word boundaries, so 'ai' does not hit inside 'maintain'.
+    """
+
+    __slots__ = ('terms', '_goto', '_fail', '_out', '_bounds')
+
+    def __init__(self, terms: Iterable[str]):
+        normalized = {normalize_term(term) for term in terms}
+        normalized.discard('')
+        self.terms = tuple(sorted(normalized))
+        self._bounds = {
+            term: (_is_word_char(term[0]), _is_word_char(term[-1]))
+            for term in self.terms
+        }
+
+        goto: List[Dict[str, int]] = [{}]
+        out: List[tuple] = [()]
+        for term in self.terms:
+            node = 0
+            for ch in term:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                node = nxt
+            out[node] = (term,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                out[child] = out[child] + out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_term(term) in self._bounds
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        return self.finditer_view(matching_view(text))
+
+    def finditer_view(self, view: str) -> Iterator[KeywordMatch]:
+        """Like ``finditer`` over text already passed through ``matching_view``."""
+        goto, fail, out, bounds = self._goto, self._fail, self._out, self._bounds
+        size = len(view)
+        node = 0
+        for i, ch in enumerate(view):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            word_after = end < size and _is_word_char(view[end])
+            for term in out[node]:
+                start = end - len(term)
+                check_start, check_end = bounds[term]
+                if check_end and word_after:
+                    continue
+                if check_start and start > 0 and _is_word_char(view[start - 1]):
+                    continue
+                yield KeywordMatch(term, start, end)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        return list(self.finditer(text))
+
+    def count(self, text: str) -> Dict[str, int]:
+        return dict(Counter(match.term for match in self.finditer(text)))
+
+    def unique(self, text: str) -> List[str]:
+        """Distinct matched terms in order of first appearance."""
+        return list(dict.fromkeys(match.term for match in self.finditer(text)))
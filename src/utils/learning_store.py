@@ -0,0 +1,112 @@
+"""Persistent learning data aggregated across sessions."""
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .resume_analyzer import get_skill_index
+from .skill_index import SkillIndex, SkillMatcher
+from .storage import default_cache_dir
+
+KEYWORD = 'keyword'
+IMPROVEMENT = 'improvement'
+SECTION = 'section'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, term)
+);
+CREATE INDEX IF NOT EXISTS counters_top ON counters (kind, count DESC);
+"""
+
+class LearningStore:
+    """SQLite-backed counters per (kind, term), shared by every session.
+
+    Updates are incremental upserts. The (kind, count) index keeps each kind
+    ordered by count as it changes, so ``top(kind, k)`` reads k rows off the
+    index instead of sorting all counters.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get('RESUME_ENHANCER_LEARNING_DB') or os.path.join(
+            default_cache_dir(), 'learning.sqlite3'
+        )
+        self._lock = threading.Lock()
+        self._matchers: Dict[str, Tuple[int, SkillIndex, SkillMatcher]] = {}
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def increment(self, kind: str, terms: Iterable[str]) -> None:
+        rows = [(kind, term) for term in terms if term]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO counters (kind, term, count) VALUES (?, ?, 1) '
+                'ON CONFLICT (kind, term) DO UPDATE SET count = count + 1',
+                rows,
+            )
+            self._conn.commit()
+
+    def top(self, kind: str, k: int) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT term, count FROM counters WHERE kind = ? '
+                'ORDER BY count DESC LIMIT ?',
+                (kind, k),
+            ).fetchall()
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute(
+                'SELECT term, count FROM counters WHERE kind = ?', (kind,)
+            ))
+
+    def terms(self, kind: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT term FROM counters WHERE kind = ?', (kind,)
+            )]
+
+    def size(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM counters WHERE kind = ?', (kind,)
+            ).fetchone()[0]
+
+    def matcher(self, kind: str) -> SkillMatcher:
+        """Word-boundary matcher over every term of ``kind``.
+
+        Aliases and misspellings resolve through the scoring skill index, so
+        a term counts as present exactly when scoring would match it. Terms
+        are only ever added, so the matcher is recompiled only when the
+        number of terms changes (including additions from other processes)
+        or the skill index is replaced.
+        """
+        size = self.size(kind)
+        index = get_skill_index()
+        cached = self._matchers.get(kind)
+        if cached is None or cached[0] != size or cached[1] is not index:
+            cached = (size, index, SkillMatcher(self.terms(kind), index))
+            self._matchers[kind] = cached
+        return cached[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM counters')
+            self._conn.commit()
+            self._matchers.clear()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_learning_store() -> LearningStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LearningStore()
+        return _store
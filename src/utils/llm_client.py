@@ -0,0 +1,215 @@
+"""Async LLM client with rate limiting, retries and pluggable backends."""
+import asyncio
+import random
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+class LLMClientError(Exception):
+    """Raised with a user-facing message when a model call cannot complete."""
+
+class TransientLLMError(Exception):
+    """Backends raise (or map errors to) this for failures worth retrying."""
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose.
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Take ``amount`` tokens if available and return 0, else the wait in seconds."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    async def acquire(self, amount: float = 1) -> None:
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits."""
+
+    def __init__(self, requests_per_minute: float = 15, tokens_per_minute: float = 250_000):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int) -> None:
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+class RetryBudget:
+    """Caps retries to a fraction of recent traffic.
+
+    Every request deposits ``ratio`` retry credits (up to ``max_balance``) and
+    every retry spends one, so a failing backend sees at most roughly
+    ``ratio`` extra load instead of a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.2, initial: float = 10, max_balance: float = 10):
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self._balance = initial
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+class GeminiBackend:
+    """Backend over one reused ``genai.GenerativeModel`` instance."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            self._model = genai.GenerativeModel(model_name=self.model_name)
+        return self._model
+
+    def is_transient(self, error: Exception) -> bool:
+        from google.api_core import exceptions
+        return isinstance(error, (
+            TransientLLMError,
+            exceptions.TooManyRequests,
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable,
+            exceptions.DeadlineExceeded,
+            exceptions.InternalServerError,
+        ))
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+class AsyncLLMClient:
+    """Rate-limited, retrying front end over a backend.
+
+    A backend provides ``async generate(prompt) -> str``, an async generator
+    ``stream(prompt)`` and optionally ``is_transient(error) -> bool``.
+    Transient failures are retried with full-jitter exponential backoff while
+    the retry budget allows; a stream is only retried before its first chunk.
+    """
+
+    def __init__(self,
+                 backend,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0):
+        self.backend = backend
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _is_transient(self, error: Exception) -> bool:
+        check = getattr(self.backend, 'is_transient', None)
+        if check is not None:
+            return check(error)
+        return isinstance(error, TransientLLMError)
+
+    async def _backoff_or_raise(self, attempt: int, error: Exception) -> None:
+        if not self._is_transient(error):
+            raise LLMClientError(f"The AI model request failed: {error}") from error
+        if attempt + 1 >= self.max_attempts or not self.retry_budget.try_withdraw():
+            raise LLMClientError(
+                "The AI model is busy or over its quota right now. "
+                "Please try again in a minute."
+            ) from error
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        await asyncio.sleep(random.uniform(0, delay))
+
+    async def generate(self, prompt: str) -> str:
+        self.retry_budget.deposit()
+        tokens = estimate_tokens(prompt)
+        for attempt in range(self.max_attempts):
+            await self.rate_limiter.acquire(tokens)
+            try:
+                return await self.backend.generate(prompt)
+            except Exception as e:
+                await self._backoff_or_raise(attempt, e)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        self.retry_budget.deposit()
+        tokens = estimate_tokens(prompt)
+        for attempt in range(self.max_attempts):
+            await self.rate_limiter.acquire(tokens)
+            started = False
+            try:
+                async for chunk in self.backend.stream(prompt):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise LLMClientError(f"The AI model response was interrupted: {e}") from e
+                await self._backoff_or_raise(attempt, e)
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    # One long-lived loop so async connections made by a backend are reused
+    # across calls from Streamlit's script threads.
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='llm-client', daemon=True).start()
+        return _loop
+
+def run_sync(coro: Awaitable[T]) -> T:
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+def iter_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """Drive an async iterator from synchronous code, one item at a time."""
+    loop = _background_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
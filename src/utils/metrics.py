@@ -0,0 +1,261 @@
+"""In-process stage timings and payload sizes, exportable as Prometheus text or JSON."""
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+METRIC_PREFIX = 'resume_enhancer'
+
+# Upper bounds in seconds, from sub-millisecond scoring to model round trips
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+MAX_RECENT_SPANS = 200
+
+class SpanRecord(NamedTuple):
+    name: str
+    parent: Optional[str]
+    depth: int
+    started: float
+    duration: float
+    error: bool
+
+class _Histogram:
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+class MetricsRegistry:
+    """Thread-safe store of span durations, error counts and sizes.
+
+    Durations go into per-stage histograms; sizes (characters, bytes,
+    tokens) are summed per name. The most recent spans are kept with their
+    parent and nesting depth, as a trace of the last requests.
+    """
+
+    def __init__(self, max_recent: int = MAX_RECENT_SPANS):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._durations: Dict[str, _Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._sizes: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._recent: deque = deque(maxlen=max_recent)
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def observe_duration(self, name: str, seconds: float, error: bool = False,
+                         parent: Optional[str] = None, depth: int = 0,
+                         started: Optional[float] = None) -> None:
+        with self._lock:
+            self._durations.setdefault(name, _Histogram()).observe(seconds)
+            if error:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            self._recent.append(SpanRecord(
+                name, parent, depth,
+                started if started is not None else time.time() - seconds,
+                seconds, error
+            ))
+
+    def record_size(self, name: str, value: float) -> None:
+        with self._lock:
+            size = self._sizes.setdefault(name, [0, 0.0, 0.0])
+            size[0] += 1
+            size[1] += value
+            size[2] = max(size[2], value)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def span(self, name: str) -> 'span':
+        return span(name, registry=self)
+
+    def recent(self, limit: Optional[int] = None) -> List[SpanRecord]:
+        with self._lock:
+            records = list(self._recent)
+        return records[-limit:] if limit else records
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+            self._sizes.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'spans': {
+                    name: {
+                        'count': hist.count,
+                        'total_seconds': hist.total,
+                        'mean_seconds': hist.total / hist.count if hist.count else 0.0,
+                        'max_seconds': hist.max,
+                        'errors': self._errors.get(name, 0),
+                    }
+                    for name, hist in sorted(self._durations.items())
+                },
+                'sizes': {
+                    name: {'count': size[0], 'total': size[1], 'max': size[2]}
+                    for name, size in sorted(self._sizes.items())
+                },
+                'counters': dict(sorted(self._counters.items())),
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        seconds = f'{METRIC_PREFIX}_stage_duration_seconds'
+        errors = f'{METRIC_PREFIX}_stage_errors_total'
+        sizes = f'{METRIC_PREFIX}_payload_size'
+        counters = f'{METRIC_PREFIX}_events_total'
+        lines = [
+            f'# HELP {seconds} Time spent in each instrumented stage.',
+            f'# TYPE {seconds} histogram',
+        ]
+        with self._lock:
+            for name, hist in sorted(self._durations.items()):
+                label = _label('stage', name)
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, hist.buckets):
+                    cumulative += count
+                    lines.append(f'{seconds}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{seconds}_bucket{{{label},le="+Inf"}} {hist.count}')
+                lines.append(f'{seconds}_sum{{{label}}} {hist.total}')
+                lines.append(f'{seconds}_count{{{label}}} {hist.count}')
+            lines += [f'# HELP {errors} Stage calls that raised.', f'# TYPE {errors} counter']
+            for name in sorted(self._durations):
+                lines.append(f'{errors}{{{_label("stage", name)}}} {self._errors.get(name, 0)}')
+            lines += [
+                f'# HELP {sizes} Sizes of prompts, responses and generated files.',
+                f'# TYPE {sizes} summary',
+            ]
+            for name, size in sorted(self._sizes.items()):
+                label = _label('name', name)
+                lines.append(f'{sizes}_sum{{{label}}} {size[1]}')
+                lines.append(f'{sizes}_count{{{label}}} {size[0]}')
+            lines += [f'# HELP {counters} Counted events.', f'# TYPE {counters} counter']
+            for name, value in sorted(self._counters.items()):
+                lines.append(f'{counters}{{{_label("event", name)}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _label(key: str, value: str) -> str:
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'{key}="{escaped}"'
+
+class span:
+    """Time a block or a function as the stage ``name``.
+
+        with span('build_prompt'):
+            ...
+
+        @span('extract_pdf')
+        def extract_text_from_pdf(...): ...
+
+    Spans nest per thread; a decorated generator is timed until exhausted
+    or closed, not just until it is created.
+    """
+
+    def __init__(self, name: str, registry: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.registry = registry
+
+    def __enter__(self):
+        registry = self.registry or get_registry()
+        stack = self._stack = registry._stack()
+        self._parent = stack[-1].name if stack else None
+        self._depth = len(stack)
+        stack.append(self)
+        self._wall = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        registry = self.registry or get_registry()
+        # A suspended generator's span can end out of order or on another
+        # thread; remove this span from the stack it was pushed on.
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i] is self:
+                del self._stack[i]
+                break
+        registry.observe_duration(self.name, elapsed, error=exc_type is not None,
+                                  parent=self._parent, depth=self._depth, started=self._wall)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        name, registry = self.name, self.registry
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                with span(name, registry):
+                    yield from func(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, registry):
+                return func(*args, **kwargs)
+        return wrapper
+
+_registry = MetricsRegistry()
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+def record_size(name: str, value: float) -> None:
+    _registry.record_size(name, value)
+
+def increment(name: str, value: int = 1) -> None:
+    _registry.increment(name, value)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = _registry
+
+    def do_GET(self):
+        if self.path.split('?')[0] == '/metrics':
+            body, content_type = self.registry.to_prometheus(), 'text/plain; version=0.0.4'
+        elif self.path.split('?')[0] == '/metrics.json':
+            body, content_type = self.registry.to_json(), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve ``/metrics`` (Prometheus) and ``/metrics.json`` from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,128 @@
+"""Analysis as a graph of independently memoized stages."""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+MAX_PIPELINE_ENTRIES = 64
+
+def fingerprint(value: Any) -> str:
+    """Content hash of a pipeline input (text, None, or JSON-like data)."""
+    raw = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8', 'surrogatepass')).hexdigest()
+
+class Stage(NamedTuple):
+    name: str
+    # Called with the values of ``inputs`` as positional arguments. A stage
+    # without a function is computed by the caller and recorded with
+    # ``Pipeline.store`` (e.g. a streamed model answer).
+    func: Optional[Callable[..., Any]]
+    inputs: Tuple[str, ...]
+
+class Pipeline:
+    """Dependency graph of stages over named base inputs.
+
+    A stage's cache key hashes its name with the keys of its inputs, down to
+    the content hashes of the base inputs, so a stage is recomputed only when
+    something it depends on changed. Results are kept in one LRU of
+    ``max_entries`` across all stages; keep the pipeline in
+    ``st.session_state`` to have them survive reruns.
+    """
+
+    def __init__(self, stages: Iterable[Stage], max_entries: int = MAX_PIPELINE_ENTRIES):
+        self.stages: Dict[str, Stage] = {}
+        # Inputs that are not earlier stages are base inputs, so declaring
+        # stages in dependency order rules out cycles.
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            if stage.name in stage.inputs:
+                raise ValueError(f"Stage {stage.name} depends on itself")
+            self.stages[stage.name] = stage
+        self.max_entries = max_entries
+        self._results: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def _key(self, name: str, inputs: Mapping[str, Any], keys: Dict[str, str]) -> str:
+        if name in keys:
+            return keys[name]
+        stage = self.stages.get(name)
+        if stage is None:
+            if name not in inputs:
+                raise KeyError(f"Missing pipeline input: {name}")
+            key = fingerprint(inputs[name])
+        else:
+            parts = [name] + [self._key(dep, inputs, keys) for dep in stage.inputs]
+            key = hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+        keys[name] = key
+        return key
+
+    def key(self, name: str, inputs: Mapping[str, Any]) -> str:
+        return self._key(name, inputs, {})
+
+    def lookup(self, name: str, inputs: Mapping[str, Any], default: Any = None) -> Any:
+        cache_key = (name, self.key(name, inputs))
+        if cache_key not in self._results:
+            return default
+        self._results.move_to_end(cache_key)
+        return self._results[cache_key]
+
+    def __contains__(self, item: Tuple[str, Mapping[str, Any]]) -> bool:
+        name, inputs = item
+        return (name, self.key(name, inputs)) in self._results
+
+    def store(self, name: str, inputs: Mapping[str, Any], value: Any) -> None:
+        self._put((name, self.key(name, inputs)), value)
+
+    def _put(self, cache_key: Tuple[str, str], value: Any) -> None:
+        self._results[cache_key] = value
+        self._results.move_to_end(cache_key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def run(self, inputs: Mapping[str, Any], targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Values of ``targets`` (default: every computable stage) and their dependencies."""
+        if targets is None:
+            targets = [name for name, stage in self.stages.items() if stage.func is not None]
+        keys: Dict[str, str] = {}
+        values: Dict[str, Any] = {}
+
+        def resolve(name):
+            if name in values:
+                return values[name]
+            stage = self.stages.get(name)
+            if stage is None:
+                values[name] = inputs[name]
+                return values[name]
+            cache_key = (name, self._key(name, inputs, keys))
+            if cache_key in self._results:
+                self.hits[name] = self.hits.get(name, 0) + 1
+                self._results.move_to_end(cache_key)
+                values[name] = self._results[cache_key]
+                return values[name]
+            if stage.func is None:
+                raise KeyError(f"Stage {name} has no result for these inputs")
+            self.misses[name] = self.misses.get(name, 0) + 1
+            value = stage.func(*[resolve(dep) for dep in stage.inputs])
+            self._put(cache_key, value)
+            values[name] = value
+            return value
+
+        for name in targets:
+            resolve(name)
+        return {name: value for name, value in values.items() if name in self.stages}
+
+    def clear(self) -> None:
+        self._results.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {'hits': self.hits.get(name, 0), 'misses': self.misses.get(name, 0)}
+            for name in self.stages
+        }
+
+    def stage_names(self) -> List[str]:
+        return list(self.stages)
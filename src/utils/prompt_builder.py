@@ -0,0 +1,199 @@
+"""Token-budgeted feedback prompt with resume and job description compaction."""
+import os
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+from .llm_client import estimate_tokens
+from .resume_analyzer import extract_keywords, get_keyword_matcher
+from .section_segmenter import PREAMBLE, get_section_index
+
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('PROMPT_TOKEN_BUDGET', 3000))
+
+# Share of the variable part of the budget the job description may take when
+# the resume needs the rest.
+JOB_DESCRIPTION_SHARE = 0.35
+
+# Base priority when a section has no job keywords; higher survives longer.
+SECTION_PRIORITY = {
+    PREAMBLE: 6, 'experience': 5, 'skills': 4, 'projects': 3, 'summary': 2,
+    'education': 1,
+}
+
+_PAGE_NUMBER_RE = re.compile(r'^(?:page\s*)?\d+(?:\s*(?:of|/)\s*\d+)?$', re.IGNORECASE)
+
+_JD_BOILERPLATE_RE = re.compile(
+    r'equal (?:employment )?opportunity|affirmative action|without regard to'
+    r'|reasonable accommodation|all qualified applicants|e-verify'
+    r'|background check|drug[- ]free|privacy (?:notice|policy)'
+    r'|applicant data|protected (?:veteran|characteristic)|disability status'
+    r'|sexual orientation|gender identity|national origin|recruitment agencies'
+    r'|unsolicited (?:resumes|applications)',
+    re.IGNORECASE,
+)
+
+_TEMPLATE = """As an expert career advisor, provide specific suggestions to improve this resume.
+
+Current Scores:
+{scores}
+
+Areas to focus on:
+{focus}
+
+Resume:
+{resume}
+{job}
+Provide specific, actionable improvements for:
+1. Making the resume more ATS-friendly
+2. Strengthening achievement descriptions
+3. Improving overall impact and readability
+4. Optimizing format and structure
+"""
+
+
+class BuiltPrompt(NamedTuple):
+    prompt: str
+    tokens: int
+    original_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = [' '.join(line.split()) for line in text.splitlines()]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def drop_repeated_lines(text: str, min_repeats: int = 3) -> str:
+    """Remove page numbers and page headers/footers repeated across pages.
+
+    The first occurrence of a repeated line is kept, since a header usually
+    carries the candidate's name.
+    """
+    lines = text.splitlines()
+    repeats = Counter(line for line in lines if len(line) > 2)
+    seen = set()
+    kept = []
+    for line in lines:
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        if repeats[line] >= min_repeats:
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def strip_jd_boilerplate(text: str) -> str:
+    """Drop legal and recruiting boilerplate sentences from a job description."""
+    kept = []
+    for line in text.splitlines():
+        if _JD_BOILERPLATE_RE.search(line):
+            sentences = re.split(r'(?<=[.!?])\s+', line)
+            line = ' '.join(s for s in sentences if not _JD_BOILERPLATE_RE.search(s))
+        kept.append(line)
+    return normalize_whitespace('\n'.join(kept))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Keep whole lines from the start while they fit in ``budget`` tokens."""
+    if estimate_tokens(text) <= budget:
+        return text
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept)
+
+
+def compact_resume(text: str, budget: int, job_keywords: List[str]) -> str:
+    """Fit the resume into ``budget`` tokens, keeping the most relevant sections.
+
+    Sections are ranked by how many job keywords they mention, then by
+    SECTION_PRIORITY; they are emitted in document order.
+    """
+    text = drop_repeated_lines(normalize_whitespace(text))
+    if estimate_tokens(text) <= budget:
+        return text
+
+    index = get_section_index(text)
+    wanted = set(job_keywords)
+    matcher = get_keyword_matcher()
+    blocks = []
+    for position, span in enumerate(index.spans):
+        header = '' if span.section == PREAMBLE else span.section.upper() + '\n'
+        body = header + text[span.start:span.end].strip()
+        relevance = sum(
+            count for term, count in matcher.count(body).items() if term in wanted
+        )
+        blocks.append((relevance, SECTION_PRIORITY.get(span.section, 0), position, body))
+
+    chosen = {}
+    remaining = budget
+    for relevance, priority, position, body in sorted(
+        blocks, key=lambda block: (-block[0], -block[1], block[2])
+    ):
+        if remaining <= 0:
+            break
+        body = truncate_to_tokens(body, remaining)
+        if body:
+            chosen[position] = body
+            remaining -= estimate_tokens(body)
+    return '\n\n'.join(chosen[position] for position in sorted(chosen))
+
+
+def _focus_lines(section_analysis: Dict) -> str:
+    present = [s for s, d in section_analysis.items() if d.get('content')]
+    missing = [s for s, d in section_analysis.items() if not d.get('content')]
+    lines = [
+        f"- {section.title()}: {section_analysis[section]['suggestions']}"
+        for section in present
+    ]
+    if missing:
+        lines.append(f"- Missing sections: {', '.join(s.title() for s in missing)}")
+    return '\n'.join(lines)
+
+
+def build_prompt(resume_text: str,
+                 job_description: Optional[str],
+                 analysis: Dict,
+                 token_budget: Optional[int] = None) -> BuiltPrompt:
+    """Compose the feedback prompt within ``token_budget`` estimated tokens."""
+    token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+    scores = '\n'.join(
+        f"- {name.replace('_', ' ').title()}: {value:.1f}%"
+        for name, value in analysis['scores'].items()
+    )
+    focus = _focus_lines(analysis['section_analysis'])
+
+    fixed = estimate_tokens(_TEMPLATE.format(scores=scores, focus=focus, resume='', job=''))
+    available = max(0, token_budget - fixed)
+
+    job = strip_jd_boilerplate(job_description) if job_description else ''
+    resume_need = estimate_tokens(normalize_whitespace(resume_text))
+    job_budget = max(int(available * JOB_DESCRIPTION_SHARE), available - resume_need)
+    job = truncate_to_tokens(job, job_budget)
+    resume_budget = available - (estimate_tokens(job) if job else 0)
+    resume = compact_resume(resume_text, resume_budget, extract_keywords(job))
+
+    prompt = _TEMPLATE.format(
+        scores=scores,
+        focus=focus,
+        resume=resume,
+        job=f"\nJob Description:\n{job}\n" if job else '',
+    )
+    # What the uncompacted prompt would have cost: raw texts plus every
+    # section's suggestion string.
+    original = estimate_tokens(_TEMPLATE.format(
+        scores=scores,
+        focus='\n'.join(d['suggestions'] for d in analysis['section_analysis'].values()),
+        resume=resume_text,
+        job=f"\nJob Description:\n{job_description}\n" if job_description else '',
+    ))
+    return BuiltPrompt(prompt, estimate_tokens(prompt), original)
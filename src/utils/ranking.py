@@ -0,0 +1,99 @@
+"""Rank many resumes against many job descriptions with one sparse product."""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .keyword_engine import KeywordMatcher
+from .resume_analyzer import get_keyword_matcher
+
+WEIGHTINGS = ('binary', 'tfidf')
+
+def build_term_matrix(texts: Sequence[str],
+                      vocabulary: Dict[str, int],
+                      matcher: KeywordMatcher,
+                      counts: bool = False) -> sparse.csr_matrix:
+    """One row per text over ``vocabulary``: presence flags, or term counts."""
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        if counts:
+            found = matcher.count(text)
+        else:
+            found = dict.fromkeys(matcher.unique(text), 1)
+        for term, value in found.items():
+            indices.append(vocabulary[term])
+            data.append(value)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), indices, indptr),
+        shape=(len(texts), len(vocabulary)),
+    )
+
+def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+def _top_k(scores: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+    # Best k columns of every row, highest score first.
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    best = np.take_along_axis(part, order, axis=1)
+    best_scores = np.take_along_axis(part_scores, order, axis=1)
+    return [
+        [(int(i), float(s)) for i, s in zip(row, row_scores)]
+        for row, row_scores in zip(best, best_scores)
+    ]
+
+class MatchMatrix:
+    """Keyword match scores (0-100) for N resumes x M job descriptions.
+
+    ``binary`` weighting reproduces ``calculate_resume_scores``' keyword_match:
+    the share of a job's keywords found in the resume. ``tfidf`` uses cosine
+    similarity of TF-IDF vectors, with IDF taken from the resume corpus.
+    """
+
+    def __init__(self,
+                 resumes: Sequence[str],
+                 job_descriptions: Sequence[str],
+                 weighting: str = 'binary',
+                 matcher: Optional[KeywordMatcher] = None):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"weighting must be one of {WEIGHTINGS}")
+        self.matcher = matcher or get_keyword_matcher()
+        self.vocabulary = {term: i for i, term in enumerate(self.matcher.terms)}
+        self.weighting = weighting
+
+        counts = weighting == 'tfidf'
+        resume_matrix = build_term_matrix(resumes, self.vocabulary, self.matcher, counts)
+        job_matrix = build_term_matrix(job_descriptions, self.vocabulary, self.matcher, counts)
+
+        if counts:
+            doc_freq = np.bincount(resume_matrix.indices, minlength=len(self.vocabulary))
+            idf = np.log((1 + len(resumes)) / (1 + doc_freq)) + 1
+            idf = sparse.diags(idf.astype(np.float32))
+            resume_matrix = _l2_normalize(resume_matrix @ idf)
+            job_matrix = _l2_normalize(job_matrix @ idf)
+        else:
+            job_sizes = np.asarray(job_matrix.sum(axis=1)).ravel()
+            job_sizes[job_sizes == 0] = 1.0
+            job_matrix = sparse.diags(1.0 / job_sizes) @ job_matrix
+
+        product = resume_matrix @ job_matrix.T
+        self.scores = np.asarray(product.todense(), dtype=np.float32) * 100
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.scores.shape
+
+    def top_candidates(self, k: int = 10) -> List[List[Tuple[int, float]]]:
+        """For each job, the ``k`` best (resume index, score) pairs."""
+        return _top_k(self.scores.T, k)
+
+    def top_jobs(self, k: int = 10) -> List[List[Tuple[int, float]]]:
+        """For each resume, the ``k`` best (job index, score) pairs."""
+        return _top_k(self.scores, k)
@@ -0,0 +1,138 @@
+"""Persistent, content-addressed cache for LLM responses."""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .storage import default_cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+def cache_key(model_name: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(prompt.encode('utf-8'))
+    return digest.hexdigest()
+
+def cache_disabled_by_env() -> bool:
+    return os.environ.get('RESUME_ENHANCER_DISABLE_CACHE', '').lower() in ('1', 'true', 'yes')
+
+class ResponseCache:
+    """SQLite-backed LRU keyed on a hash of model name and prompt.
+
+    Entries older than ``ttl`` seconds are treated as misses. After each write
+    the least recently used entries are evicted until the cache holds at most
+    ``max_entries`` responses and ``max_bytes`` of response text.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_entries: int = 5000,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 7 * 24 * 3600,
+                 enabled: bool = True):
+        self.path = path or os.path.join(default_cache_dir(), 'responses.sqlite3')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled and not cache_disabled_by_env()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE key = ?', (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, response, len(response.encode('utf-8')), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        self._conn.execute(
+            'DELETE FROM responses WHERE key IN ('
+            ' SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
+        self._conn.execute(
+            'DELETE FROM responses WHERE key IN ('
+            ' SELECT key FROM (SELECT key, SUM(size) OVER'
+            '  (ORDER BY last_access DESC, key) AS running FROM responses)'
+            ' WHERE running > ?)',
+            (self.max_bytes,),
+        )
+
+    def get_or_generate(self,
+                        model_name: str,
+                        prompt: str,
+                        generate: Callable[[], str],
+                        bypass: bool = False) -> str:
+        """Return the cached response, or call ``generate`` and store its result.
+
+        ``bypass`` (or a disabled cache) skips the lookup and the write.
+        """
+        if bypass or not self.enabled:
+            return generate()
+        key = cache_key(model_name, prompt)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        response = generate()
+        self.set(key, response)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
@@ -1,76 +1,124 @@
-import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-def calculate_keyword_match(resume_text: str, job_description: str) -> Tuple[List[str], List[str]]:
+from .keyword_engine import KeywordMatch, load_taxonomy
+from .metrics import span
+from .section_segmenter import get_section_index
+from .skill_index import SkillIndex, SkillMatcher, load_skill_index
+from .text_document import TextDocument, get_document
+
+# Scorers take a str or a TextDocument; either way the text is tokenized once
+# (see text_document.get_document) and its keyword matches are reused.
+Text = Union[str, TextDocument]
+
+@span('keyword_match')
+def calculate_keyword_match(resume_text: Text, job_description: Text) -> Tuple[List[str], List[str]]:
+    """Job description keywords found and not found in the resume, in JD order."""
     job_keywords = extract_keywords(job_description)
-    resume_keywords = extract_keywords(resume_text)
+    resume_keywords = set(extract_keywords(resume_text))
     
-    matched = list(set(job_keywords) & set(resume_keywords))
-    missing = list(set(job_keywords) - set(resume_keywords))
+    matched = [keyword for keyword in job_keywords if keyword in resume_keywords]
+    missing = [keyword for keyword in job_keywords if keyword not in resume_keywords]
     
     return matched, missing
 
-def calculate_resume_scores(resume_text: str, job_description: str = None) -> Dict[str, float]:
+def keyword_match_score(matched: List[str], missing: List[str]) -> float:
+    total = len(matched) + len(missing)
+    return (len(matched) / total) * 100 if total else 0.0
+
+@span('resume_scores')
+def calculate_resume_scores(resume_text: Text,
+                            job_description: Optional[Text] = None,
+                            keyword_match: Optional[Tuple[List[str], List[str]]] = None) -> Dict[str, float]:
+    """Scores of the resume; pass ``keyword_match`` (from calculate_keyword_match)
+    when it has already been computed to avoid matching again."""
+    document = get_document(resume_text)
     scores = {
-        'readability': calculate_readability_score(resume_text),
-        'formatting': calculate_formatting_score(resume_text),
-        'content': calculate_content_score(resume_text),
+        'readability': calculate_readability_score(document),
+        'formatting': calculate_formatting_score(document),
+        'content': calculate_content_score(document),
     }
     
-    if job_description:
-        matched, missing = calculate_keyword_match(resume_text, job_description)
-        scores['keyword_match'] = (len(matched) / (len(matched) + len(missing))) * 100
+    if keyword_match is None and job_description:
+        keyword_match = calculate_keyword_match(document, job_description)
+    if keyword_match is not None:
+        scores['keyword_match'] = keyword_match_score(*keyword_match)
         
     return scores
 
-def extract_keywords(text: str) -> List[str]:
-    technical_keywords = [
-        'python', 'java', 'javascript', 'react', 'node', 'aws', 'docker',
-        'kubernetes', 'ci/cd', 'agile', 'scrum', 'machine learning', 'ai',
-        'data science', 'cloud', 'devops', 'frontend', 'backend', 'fullstack'
-    ]
-    
-    soft_skills = [
-        'leadership', 'communication', 'teamwork', 'problem solving',
-        'analytical', 'project management', 'time management', 'collaborative'
-    ]
-    words = set(re.findall(r'\b\w+\b', text.lower()))
-    return [word for word in words if word in technical_keywords + soft_skills]
-
-def analyze_resume_sections(resume_text: str) -> Dict[str, Dict[str, str]]:
-    sections = {
-        'summary': {
-            'content': extract_section(resume_text, 'summary'),
-            'suggestions': analyze_summary_section(extract_section(resume_text, 'summary'))
-        },
-        'experience': {
-            'content': extract_section(resume_text, 'experience'),
-            'suggestions': analyze_experience_section(extract_section(resume_text, 'experience'))
-        },
-        'education': {
-            'content': extract_section(resume_text, 'education'),
-            'suggestions': analyze_education_section(extract_section(resume_text, 'education'))
-        },
-        'skills': {
-            'content': extract_section(resume_text, 'skills'),
-            'suggestions': analyze_skills_section(extract_section(resume_text, 'skills'))
+TECHNICAL_KEYWORDS = [
+    'python', 'java', 'javascript', 'react', 'node', 'aws', 'docker',
+    'kubernetes', 'ci/cd', 'agile', 'scrum', 'machine learning', 'ai',
+    'data science', 'cloud', 'devops', 'frontend', 'backend', 'fullstack'
+]
+
+SOFT_SKILLS = [
+    'leadership', 'communication', 'teamwork', 'problem solving',
+    'analytical', 'project management', 'time management', 'collaborative'
+]
+
+# Aliases, abbreviations and misspellings ('k8s', 'ReactJS', 'ML') are
+# matched as the canonical taxonomy term they stand for.
+_skill_index = load_skill_index()
+_keyword_matcher = SkillMatcher(TECHNICAL_KEYWORDS + SOFT_SKILLS, _skill_index)
+
+def get_keyword_matcher() -> SkillMatcher:
+    return _keyword_matcher
+
+def get_skill_index() -> SkillIndex:
+    return _skill_index
+
+def set_keyword_taxonomy(terms: Iterable[str]) -> SkillMatcher:
+    """Replace the keyword taxonomy; the matcher is compiled once here."""
+    global _keyword_matcher
+    _keyword_matcher = SkillMatcher(terms, _skill_index)
+    return _keyword_matcher
+
+def set_skill_index(index: SkillIndex) -> SkillMatcher:
+    """Replace the alias and spelling index, keeping the current taxonomy."""
+    global _skill_index
+    _skill_index = index
+    return set_keyword_taxonomy(_keyword_matcher.terms)
+
+def load_keyword_taxonomy(path: str) -> SkillMatcher:
+    return set_keyword_taxonomy(load_taxonomy(path))
+
+def extract_keywords(text: Text) -> List[str]:
+    return get_document(text).keywords(_keyword_matcher)
+
+def extract_keyword_matches(text: Text) -> List[KeywordMatch]:
+    return list(get_document(text).keyword_matches(_keyword_matcher))
+
+def count_keywords(text: Text) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for match in get_document(text).keyword_matches(_keyword_matcher):
+        counts[match.term] = counts.get(match.term, 0) + 1
+    return counts
+
+@span('section_analysis')
+def analyze_resume_sections(resume_text: Text) -> Dict[str, Dict[str, str]]:
+    index = get_section_index(get_document(resume_text).text)
+    sections = {}
+    for section, analyze in SECTION_ANALYZERS.items():
+        content = index.get(section)
+        sections[section] = {
+            'content': content,
+            'suggestions': analyze(content)
         }
-    }
     return sections
 
 def extract_section(text: str, section_name: str) -> str:
-    return ""
+    return get_section_index(text).get(section_name)
 
-def calculate_readability_score(text: str) -> float:
-    sentences = text.split('.')
-    avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+def calculate_readability_score(text: Text) -> float:
+    document = get_document(text)
+    avg_sentence_length = document.token_count / document.sentence_count
     readability = 100 - (avg_sentence_length - 15) * 2
     return max(0, min(100, readability))
 
-def calculate_formatting_score(text: str) -> float:
+def calculate_formatting_score(text: Text) -> float:
     return 85.0
 
-def calculate_content_score(text: str) -> float:
+def calculate_content_score(text: Text) -> float:
     return 90.0
 
 def analyze_summary_section(text: str) -> str:
@@ -83,4 +131,15 @@ def analyze_education_section(text: str) -> str:
     return "Include relevant coursework and academic achievements."
 
 def analyze_skills_section(text: str) -> str:
-    return "Group skills by category and highlight proficiency levels."
\ No newline at end of file
+    return "Group skills by category and highlight proficiency levels."
+
+def analyze_projects_section(text: str) -> str:
+    return "Describe the problem, your role, the tools used and a measurable outcome."
+
+SECTION_ANALYZERS = {
+    'summary': analyze_summary_section,
+    'experience': analyze_experience_section,
+    'education': analyze_education_section,
+    'skills': analyze_skills_section,
+    'projects': analyze_projects_section,
+}
@@ -0,0 +1,150 @@
+"""Single-pass resume section segmentation with a memoized offset index."""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
+
+PREAMBLE = 'contact'
+
+SECTION_ALIASES = {
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'profile',
+        'professional profile', 'objective', 'career objective', 'about me',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience',
+        'employment', 'employment history', 'work history', 'career history',
+    ],
+    'education': [
+        'education', 'academic background', 'education and training',
+        'academic qualifications', 'qualifications',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills',
+        'core competencies', 'competencies', 'technologies',
+    ],
+    'projects': ['projects', 'personal projects', 'key projects', 'academic projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'licenses and certifications'],
+    'awards': ['awards', 'honors', 'honours', 'achievements', 'awards and honors'],
+    'publications': ['publications', 'research'],
+    'languages': ['languages'],
+    'volunteering': ['volunteering', 'volunteer experience', 'volunteer work'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests'],
+}
+
+_ALIAS_TO_SECTION = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# A header is a whole line holding one alias, optionally prefixed with
+# markdown '#' and followed by ':'; inline content after the colon belongs to
+# the section ("Skills: Python, SQL").
+_HEADER_RE = re.compile(
+    r'^[ \t]*(?:#+[ \t]*)?(?P<header>'
+    + '|'.join(
+        re.escape(alias).replace(r'\ ', r'[ \t]+')
+        for alias in sorted(_ALIAS_TO_SECTION, key=len, reverse=True)
+    )
+    + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Aliases that double as sub-labels inside other sections ("Languages:
+# Python, Go" under Skills, "Research: ..." in an experience entry) only
+# start a section on a line of their own.
+_STANDALONE_ONLY = frozenset({
+    'languages', 'technologies', 'research', 'qualifications', 'achievements',
+})
+
+_CACHE_SIZE = 256
+_cache: 'OrderedDict[str, Tuple[SectionSpan, ...]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class SectionSpan(NamedTuple):
+    section: str
+    start: int
+    end: int
+
+
+def segment_sections(text: str) -> Tuple[SectionSpan, ...]:
+    """Find every section in one regex pass; spans cover the section bodies.
+
+    Text before the first header is reported as the ``contact`` section.
+    """
+    spans: List[SectionSpan] = []
+    section, start = PREAMBLE, 0
+    for match in _HEADER_RE.finditer(text):
+        alias = ' '.join(match.group('header').lower().split())
+        if alias in _STANDALONE_ONLY:
+            line_end = text.find('\n', match.end())
+            if text[match.end():line_end if line_end != -1 else len(text)].strip():
+                continue
+        spans.append(SectionSpan(section, start, match.start()))
+        section = _ALIAS_TO_SECTION[alias]
+        start = match.end()
+    spans.append(SectionSpan(section, start, len(text)))
+    return tuple(span for span in spans if text[span.start:span.end].strip())
+
+
+def document_digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class SectionIndex:
+    """Offset index of a document's sections; bodies are sliced on demand."""
+
+    __slots__ = ('text', 'spans')
+
+    def __init__(self, text: str, spans: Tuple[SectionSpan, ...]):
+        self.text = text
+        self.spans = spans
+
+    def __contains__(self, section: str) -> bool:
+        return any(span.section == section for span in self.spans)
+
+    def sections(self) -> List[str]:
+        return list(dict.fromkeys(span.section for span in self.spans))
+
+    def get(self, section: str) -> str:
+        # Repeated headers (two "Projects" blocks) are joined in order.
+        return '\n'.join(
+            self.text[span.start:span.end].strip()
+            for span in self.spans if span.section == section
+        )
+
+    def as_dict(self) -> Dict[str, str]:
+        return {section: self.get(section) for section in self.sections()}
+
+
+def get_section_index(text: str) -> SectionIndex:
+    digest = document_digest(text)
+    with _cache_lock:
+        spans = _cache.get(digest)
+        if spans is not None:
+            _cache.move_to_end(digest)
+    if spans is None:
+        spans = segment_sections(text)
+        with _cache_lock:
+            _cache[digest] = spans
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return SectionIndex(text, spans)
+
+
+def build_resume_data(text: str) -> Dict:
+    """Structured ``resume_data`` for ResumeImageGenerator, read from the index."""
+    index = get_section_index(text)
+    resume_data = {
+        section: content for section, content in index.as_dict().items()
+        if section != PREAMBLE
+    }
+    contact_lines = [line.strip() for line in index.get(PREAMBLE).splitlines() if line.strip()]
+    resume_data['personal_info'] = {
+        'name': contact_lines[0] if contact_lines else 'Your Name',
+        'email': next((line for line in contact_lines if '@' in line), ''),
+        'phone': '',
+        'location': '',
+    }
+    return resume_data
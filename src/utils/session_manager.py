@@ -1,69 +1,89 @@
 import streamlit as st
+from collections import deque
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from .history_store import HistoryStore
+from .learning_store import (
+    IMPROVEMENT,
+    KEYWORD,
+    SECTION,
+    LearningStore,
+    get_learning_store
+)
+
+# Recent section bodies kept per section for learning; older ones are only counted.
+MAX_SECTION_SAMPLES = 20
+
+# How many entries the learned insights show
+TOP_KEYWORDS = 20
+TOP_IMPROVEMENTS = 5
+
 class SessionManager:
-    def __init__(self):
+    def __init__(self, learning_store: Optional[LearningStore] = None):
+        # Aggregated learning (keywords, improvements, section counts) is
+        # shared across sessions; recent section samples stay per session.
+        self.learning_store = learning_store or get_learning_store()
         if 'resume_history' not in st.session_state:
-            st.session_state.resume_history = []
+            st.session_state.resume_history = HistoryStore()
         if 'learning_data' not in st.session_state:
             st.session_state.learning_data = {
-                'successful_keywords': set(),
-                'common_improvements': {},
-                'section_patterns': {},
-                'industry_specific_terms': set()
+                'section_patterns': {}
             }
 
     def add_to_history(self, 
                       resume_text: str, 
                       analysis_results: Dict,
                       job_description: Optional[str] = None,
-                      is_modified: bool = False) -> None:
+                      is_modified: bool = False,
+                      lineage_id: Optional[str] = None) -> None:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        history_entry = {
-            'timestamp': timestamp,
-            'resume_text': resume_text,
-            'job_description': job_description,
-            'analysis_results': analysis_results,
-            'is_modified': is_modified
-        }
-        
-        # If there are previous entries for this resume, mark this as latest
-        history_entry['is_latest'] = True
-        for prev_entry in st.session_state.resume_history:
-            if prev_entry['resume_text'] == resume_text:
-                prev_entry['is_latest'] = False
-        
-        st.session_state.resume_history.append(history_entry)
+        # Entries of the same lineage (lineage_id, or identical resume text)
+        # are versions of one resume; the store tracks the latest of each.
+        st.session_state.resume_history.add(
+            resume_text,
+            analysis_results,
+            job_description=job_description,
+            timestamp=timestamp,
+            is_modified=is_modified,
+            lineage_id=lineage_id
+        )
         self._learn_from_analysis(analysis_results)
 
     def get_history(self) -> List[Dict]:
-        return st.session_state.resume_history
+        return st.session_state.resume_history.entries()
+
+    def get_history_by_lineage(self) -> Dict[str, List[Dict]]:
+        """History grouped per resume lineage, each list oldest version first."""
+        history = st.session_state.resume_history
+        return {
+            lineage: [history.entry(entry_id) for entry_id in entry_ids]
+            for lineage, entry_ids in history.lineages().items()
+        }
 
     def clear_history(self) -> None:
-        st.session_state.resume_history = []
+        st.session_state.resume_history.clear()
+
+    def memory_footprint(self) -> Dict[str, int]:
+        return st.session_state.resume_history.memory_footprint()
 
     def _learn_from_analysis(self, analysis_results: Dict) -> None:
         if 'keyword_matches' in analysis_results:
             matched_keywords = analysis_results['keyword_matches'].get('matched', [])
-            st.session_state.learning_data['successful_keywords'].update(matched_keywords)
+            self.learning_store.increment(KEYWORD, matched_keywords)
 
         if 'ai_suggestions' in analysis_results:
             suggestions = analysis_results['ai_suggestions']
-            for improvement in self._extract_improvements(suggestions):
-                if improvement in st.session_state.learning_data['common_improvements']:
-                    st.session_state.learning_data['common_improvements'][improvement] += 1
-                else:
-                    st.session_state.learning_data['common_improvements'][improvement] = 1
+            self.learning_store.increment(IMPROVEMENT, self._extract_improvements(suggestions))
 
         if 'section_analysis' in analysis_results:
+            section_patterns = st.session_state.learning_data['section_patterns']
             for section, details in analysis_results['section_analysis'].items():
-                if section not in st.session_state.learning_data['section_patterns']:
-                    st.session_state.learning_data['section_patterns'][section] = []
-                st.session_state.learning_data['section_patterns'][section].append(
-                    details.get('content', '')
-                )
+                if section not in section_patterns:
+                    section_patterns[section] = deque(maxlen=MAX_SECTION_SAMPLES)
+                section_patterns[section].append(details.get('content', ''))
+            self.learning_store.increment(SECTION, analysis_results['section_analysis'])
 
     def _extract_improvements(self, suggestions: str) -> List[str]:
         improvements = []
@@ -74,26 +94,27 @@ class SessionManager:
 
     def get_learned_insights(self) -> Dict:
         return {
-            'top_keywords': list(st.session_state.learning_data['successful_keywords']),
-            'common_improvements': dict(sorted(
-                st.session_state.learning_data['common_improvements'].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]),
-            'section_patterns': {
-                section: len(patterns)
-                for section, patterns in st.session_state.learning_data['section_patterns'].items()
-            }
+            'top_keywords': [
+                keyword for keyword, _ in self.learning_store.top(KEYWORD, TOP_KEYWORDS)
+            ],
+            'common_improvements': dict(self.learning_store.top(IMPROVEMENT, TOP_IMPROVEMENTS)),
+            'section_patterns': self.learning_store.counts(SECTION)
         }
 
     def get_personalized_suggestions(self, resume_text: str) -> List[str]:
         suggestions = []
         
         # Check for successful keywords
-        if st.session_state.learning_data['successful_keywords']:
+        # One pass of the precompiled matcher over the resume, on word
+        # boundaries, instead of a lowercase substring test per keyword
+        # Only the most matched keywords are suggested: the store is shared by
+        # every session and its term list grows without bound
+        matcher = self.learning_store.matcher(KEYWORD)
+        if len(matcher):
+            present = set(matcher.unique(resume_text))
             missing_keywords = [
-                keyword for keyword in st.session_state.learning_data['successful_keywords']
-                if keyword.lower() not in resume_text.lower()
+                keyword for keyword, _ in self.learning_store.top(KEYWORD, TOP_KEYWORDS)
+                if keyword not in present
             ]
             if missing_keywords:
                 suggestions.append(
@@ -101,11 +122,7 @@ class SessionManager:
                 )
 
         # Suggest common improvements
-        top_improvements = dict(sorted(
-            st.session_state.learning_data['common_improvements'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:3])
+        top_improvements = dict(self.learning_store.top(IMPROVEMENT, 3))
         
         if top_improvements:
             suggestions.append("Common areas for improvement:")
@@ -0,0 +1,249 @@
+"""Skill normalization: aliases and misspellings resolved to canonical skills."""
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional
+
+from .keyword_engine import KeywordMatch, KeywordMatcher, matching_view, normalize_term
+
+DEFAULT_SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.json')
+DEFAULT_COMMON_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'common_words.txt')
+
+# Single-word tokens shorter than this are only matched exactly: short words
+# are one edit away from too many others ('scrum'/'scrub').
+MIN_FUZZY_LENGTH = 6
+MAX_EDITS = 1
+GRAM_SIZE = 3
+MAX_FUZZY_MEMO = 65536
+
+_WORD_RE = re.compile(r'[a-z][a-z0-9+#]*')
+
+_MISSING = object()
+
+def load_skill_aliases(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """``{canonical: [aliases]}`` from a JSON file; defaults to the bundled
+    data/skills.json, or ``RESUME_ENHANCER_SKILLS_FILE`` when set."""
+    path = path or os.environ.get('RESUME_ENHANCER_SKILLS_FILE') or DEFAULT_SKILLS_PATH
+    with open(path, encoding='utf-8') as fh:
+        data = json.load(fh)
+    return {canonical: list(aliases) for canonical, aliases in data.items()}
+
+def load_common_words(path: Optional[str] = None) -> FrozenSet[str]:
+    """Words never taken for misspelled skills, one per line; '#' starts a comment."""
+    with open(path or DEFAULT_COMMON_WORDS_PATH, encoding='utf-8') as fh:
+        return frozenset(
+            word for word in (line.split('#', 1)[0].strip().lower() for line in fh) if word
+        )
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance of ``a`` and ``b`` counting insertions, deletions,
+    substitutions and adjacent transpositions ('pyhton') as one edit each;
+    ``limit + 1`` as soon as it is known to exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, before[j - 2] + 1)
+            current.append(value)
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+def _grams(word: str) -> List[str]:
+    padded = '\0' * (GRAM_SIZE - 1) + word + '\0' * (GRAM_SIZE - 1)
+    return [padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)]
+
+class SkillIndex:
+    """Alias hash map plus a q-gram index for near-miss spellings.
+
+    Every alias (and each canonical skill itself) maps to its canonical skill
+    in a dict, so exact lookups are O(1). Single-word surface forms of at
+    least ``min_fuzzy_length`` characters are also indexed by padded
+    trigrams: a lookup only visits forms sharing enough trigrams to be within
+    ``max_edits`` edits (the q-gram lemma), then verifies them with a bounded
+    edit distance. Work therefore depends on the token, not on the size of
+    the taxonomy. Fuzzy results are memoized per token. ``common_words``
+    are real words that happen to be one edit from a skill ('backed',
+    'docked'); they are only ever matched exactly.
+    """
+
+    def __init__(self,
+                 aliases: Mapping[str, Iterable[str]],
+                 max_edits: int = MAX_EDITS,
+                 min_fuzzy_length: int = MIN_FUZZY_LENGTH,
+                 common_words: Iterable[str] = ()):
+        self.max_edits = max_edits
+        self.min_fuzzy_length = min_fuzzy_length
+        self.common_words = frozenset(common_words)
+        self._aliases = {normalize_term(canonical): list(forms) for canonical, forms in aliases.items()}
+        self.surfaces: Dict[str, str] = {}
+        for canonical, forms in self._aliases.items():
+            for form in [canonical] + forms:
+                form = normalize_term(form)
+                if not form:
+                    continue
+                owner = self.surfaces.setdefault(form, canonical)
+                if owner != canonical:
+                    raise ValueError(f"'{form}' is listed for both '{owner}' and '{canonical}'")
+
+        self._fuzzy_forms: List[str] = []
+        self._gram_index: Dict[str, List[int]] = defaultdict(list)
+        for form in self.surfaces:
+            if ' ' in form or len(form) < min_fuzzy_length:
+                continue
+            form_id = len(self._fuzzy_forms)
+            self._fuzzy_forms.append(form)
+            for gram in set(_grams(form)):
+                self._gram_index[gram].append(form_id)
+        self._memo: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_term(term) in self._aliases
+
+    @property
+    def canonical_terms(self) -> List[str]:
+        return list(self._aliases)
+
+    def restricted(self, vocabulary: Iterable[str]) -> 'SkillIndex':
+        """Index over ``vocabulary`` only, keeping the aliases known for each term."""
+        terms = {normalize_term(term) for term in vocabulary}
+        terms.discard('')
+        return SkillIndex(
+            {term: self._aliases.get(term, []) for term in terms},
+            self.max_edits,
+            self.min_fuzzy_length,
+            self.common_words,
+        )
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical skill for ``term``: an exact alias, else a close single-word spelling."""
+        term = normalize_term(term)
+        found = self.surfaces.get(term)
+        if found is None and ' ' not in term:
+            found = self.fuzzy(term)
+        return found
+
+    def fuzzy(self, token: str) -> Optional[str]:
+        """Canonical skill of the unique closest form within ``max_edits``, if any."""
+        found = self._memo.get(token, _MISSING)
+        if found is not _MISSING:
+            return found
+        if len(token) < self.min_fuzzy_length or token in self.common_words:
+            found = None
+        else:
+            found = self._fuzzy_lookup(token)
+        if len(self._memo) >= MAX_FUZZY_MEMO:
+            self._memo.clear()
+        self._memo[token] = found
+        return found
+
+    def _fuzzy_lookup(self, token: str) -> Optional[str]:
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in set(_grams(token)):
+            for form_id in self._gram_index.get(gram, ()):
+                shared[form_id] += 1
+        best_distance = self.max_edits + 1
+        best: Optional[str] = None
+        for form_id, count in shared.items():
+            form = self._fuzzy_forms[form_id]
+            # An edit changes at most GRAM_SIZE padded trigrams (GRAM_SIZE + 1
+            # for a transposition), so closer forms share at least this many
+            needed = max(len(form), len(token)) + GRAM_SIZE - 1 - self.max_edits * (GRAM_SIZE + 1)
+            if count < needed or form[0] != token[0]:
+                continue
+            distance = bounded_edit_distance(token, form, self.max_edits)
+            canonical = self.surfaces[form]
+            if distance < best_distance:
+                best_distance, best = distance, canonical
+            elif distance == best_distance and canonical != best:
+                # Equally close to two different skills: too ambiguous to guess
+                best = None
+        return best
+
+class SkillMatcher:
+    """Keyword matcher that reports canonical skills.
+
+    Drop-in for ``KeywordMatcher`` (``terms``, ``finditer``, ``count``,
+    ``unique``...): aliases are found in the same single Aho-Corasick pass
+    as the terms themselves, then words left unmatched are looked up in the
+    fuzzy index. Every match's ``term`` is a canonical term of ``terms``.
+    """
+
+    __slots__ = ('terms', 'index', '_exact')
+
+    def __init__(self, terms: Iterable[str], index: Optional[SkillIndex] = None):
+        self.index = (index or SkillIndex({})).restricted(terms)
+        self.terms = tuple(sorted(self.index.canonical_terms))
+        self._exact = KeywordMatcher(self.index.surfaces)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.index
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        return self.finditer_view(matching_view(text))
+
+    def finditer_view(self, view: str) -> Iterator[KeywordMatch]:
+        surfaces = self.index.surfaces
+        exact = sorted(
+            (KeywordMatch(surfaces[match.term], match.start, match.end)
+             for match in self._exact.finditer_view(view)),
+            key=lambda match: (match.start, -match.end),
+        )
+        matches = []
+        widest: Dict[str, KeywordMatch] = {}
+        covered = bytearray(len(view))
+        for match in exact:
+            # 'aws lambda' and the 'aws' inside it are one mention of aws
+            outer = widest.get(match.term)
+            if outer is not None and outer.start <= match.start and match.end <= outer.end:
+                continue
+            widest[match.term] = match
+            matches.append(match)
+            covered[match.start:match.end] = b'\1' * (match.end - match.start)
+
+        fuzzy = self.index.fuzzy
+        min_length = self.index.min_fuzzy_length
+        for word in _WORD_RE.finditer(view):
+            start, end = word.span()
+            if end - start < min_length or covered[start] or covered[end - 1]:
+                continue
+            # Word boundaries as in KeywordMatcher
+            if start and (view[start - 1].isalnum() or view[start - 1] == '_'):
+                continue
+            canonical = fuzzy(word.group())
+            if canonical is not None:
+                matches.append(KeywordMatch(canonical, start, end))
+        matches.sort(key=lambda match: (match.start, match.end))
+        return iter(matches)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        return list(self.finditer(text))
+
+    def count(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for match in self.finditer(text):
+            counts[match.term] = counts.get(match.term, 0) + 1
+        return counts
+
+    def unique(self, text: str) -> List[str]:
+        """Distinct canonical terms in order of first appearance."""
+        return list(dict.fromkeys(match.term for match in self.finditer(text)))
+
+def load_skill_index(path: Optional[str] = None, **options) -> SkillIndex:
+    options.setdefault('common_words', load_common_words())
+    return SkillIndex(load_skill_aliases(path), **options)
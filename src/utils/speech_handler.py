@@ -1,33 +1,245 @@
+import hashlib
+import io
 import os
-from gtts import gTTS
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
 import speech_recognition as sr
 import tempfile
 
+from .metrics import increment, record_size, span
+from .storage import default_cache_dir
+
+MAX_TTS_CHUNK_CHARS = 400
+TTS_WORKERS = 4
+MAX_TTS_CACHE_FILES = 1000
+
+STT_WINDOW_SECONDS = 30
+STT_OVERLAP_SECONDS = 2
+STT_WORKERS = 4
+# Longest run of words a window may repeat from the previous one's overlap.
+MAX_OVERLAP_WORDS = 20
+
+@lru_cache(maxsize=1)
+def get_recognizer() -> sr.Recognizer:
+    """Recognizer shared by every handler in the process."""
+    return sr.Recognizer()
+
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+
+def split_sentences(text: str, max_chars: int = MAX_TTS_CHUNK_CHARS) -> List[str]:
+    """Split text at sentence boundaries into chunks of at most ``max_chars``.
+
+    Consecutive short sentences share a chunk; a sentence longer than
+    ``max_chars`` is split between words.
+    """
+    chunks = []
+    current = ''
+    for sentence in _SENTENCE_BREAK_RE.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+class GTTSEngine:
+    """Google Translate TTS; any object with ``synthesize(text, lang) -> bytes``
+    can stand in for it, e.g. an offline engine in tests."""
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        # Imported on first use; most sessions never synthesize speech.
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+class GoogleRecognizer:
+    """Google Web Speech recognition; any object with
+    ``recognize(audio_data) -> str`` can replace it, e.g. a local stub."""
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None):
+        self.recognizer = recognizer or get_recognizer()
+
+    def recognize(self, audio_data: sr.AudioData) -> str:
+        try:
+            return self.recognizer.recognize_google(audio_data)
+        except sr.UnknownValueError:
+            # Silence or unintelligible audio in this window
+            return ''
+
+class TranscriptSegment(NamedTuple):
+    start: float
+    end: float
+    text: str
+
+def stitch_segments(segments: Iterable[TranscriptSegment]) -> str:
+    """Join window transcripts, dropping words repeated across an overlap."""
+    words: List[str] = []
+    for segment in segments:
+        new_words = segment.text.split()
+        limit = min(MAX_OVERLAP_WORDS, len(words), len(new_words))
+        for size in range(limit, 0, -1):
+            if [w.lower() for w in words[-size:]] == [w.lower() for w in new_words[:size]]:
+                new_words = new_words[size:]
+                break
+        words.extend(new_words)
+    return ' '.join(words)
+
 class SpeechHandler:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
+    def __init__(self,
+                 tts_engine=None,
+                 cache_dir: Optional[str] = None,
+                 workers: int = TTS_WORKERS,
+                 stt_backend=None):
+        self.recognizer = get_recognizer()
+        self.stt_backend = stt_backend or GoogleRecognizer(self.recognizer)
+        self.tts_engine = tts_engine or GTTSEngine()
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), 'tts')
+        self.workers = workers
+        os.makedirs(self.cache_dir, exist_ok=True)
 
-    def text_to_speech(self, text, lang='en'):
+    def _cache_path(self, text, lang):
+        digest = hashlib.sha256(
+            f"{type(self.tts_engine).__name__}\0{lang}\0{text}".encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.mp3")
+
+    def _synthesize_chunk(self, text, lang):
+        path = self._cache_path(text, lang)
+        try:
+            with open(path, 'rb') as fh:
+                audio = fh.read()
+            os.utime(path)
+            increment('tts_cache_hits')
+            return audio
+        except OSError:
+            pass
+        with span('tts_synthesize'):
+            audio = self.tts_engine.synthesize(text, lang)
+        record_size('tts_audio_bytes', len(audio))
+        tmp = f"{path}.{os.getpid()}.{id(text)}.tmp"
+        with open(tmp, 'wb') as fh:
+            fh.write(audio)
+        os.replace(tmp, path)
+        self._evict_cache()
+        return audio
+
+    def _evict_cache(self):
+        with os.scandir(self.cache_dir) as it:
+            files = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith('.mp3')]
+        for _, path in sorted(files)[:max(0, len(files) - MAX_TTS_CACHE_FILES)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @span('tts')
+    def iter_speech(self, text, lang='en') -> Iterator[bytes]:
+        """Yield MP3 audio per sentence chunk, in order.
+
+        Chunks are synthesized concurrently and cached by text and language;
+        the first one is yielded as soon as it is ready, so playback can start
+        before the rest finish.
+        """
+        chunks = split_sentences(text)
+        if not chunks:
+            return
         try:
-            tts = gTTS(text=text, lang=lang)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                tts.save(fp.name)
-                return fp.name
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+                futures = [pool.submit(self._synthesize_chunk, chunk, lang) for chunk in chunks]
+                for future in futures:
+                    yield future.result()
         except Exception as e:
             raise Exception(f"Error in text to speech conversion: {str(e)}")
 
-    def speech_to_text(self, audio_file):
+    def text_to_speech_bytes(self, text, lang='en') -> bytes:
+        # MP3 frames can be concatenated into one playable stream.
+        return b''.join(self.iter_speech(text, lang))
+
+    def text_to_speech(self, text, lang='en'):
+        audio = self.text_to_speech_bytes(text, lang)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
+            fp.write(audio)
+            return fp.name
+
+    @span('stt')
+    def iter_transcript(self,
+                        audio_file,
+                        window: float = STT_WINDOW_SECONDS,
+                        overlap: float = STT_OVERLAP_SECONDS,
+                        workers: int = STT_WORKERS) -> Iterator[TranscriptSegment]:
+        """Transcribe overlapping fixed-length windows, yielding them in order.
+
+        Audio is read one hop (``window - overlap`` seconds) at a time and
+        each window is recognized on a thread pool; at most ``2 * workers``
+        windows are held at once, so long recordings are never fully in
+        memory. Segment timestamps are in seconds from the start.
+        """
+        hop = window - overlap
+        if hop <= 0:
+            raise ValueError("window must be longer than overlap")
         try:
-            with sr.AudioFile(audio_file) as source:
-                audio = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio)
-                return text
+            with sr.AudioFile(audio_file) as source, \
+                    ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                tail = b''
+                position = 0.0
+                bytes_per_second = source.SAMPLE_RATE * source.SAMPLE_WIDTH
+                while True:
+                    # Read exact frame counts; Recognizer.record rounds to its buffer size
+                    seconds = window if not tail else hop
+                    data = source.stream.read(int(seconds * source.SAMPLE_RATE))
+                    if not data:
+                        break
+                    frames = tail + data
+                    start = position - len(tail) / bytes_per_second
+                    position += len(data) / bytes_per_second
+                    chunk = sr.AudioData(frames, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                    pending.append((start, position, pool.submit(self._recognize_window, chunk)))
+                    tail = frames[-int(overlap * source.SAMPLE_RATE) * source.SAMPLE_WIDTH:] if overlap else b''
+                    if len(pending) >= 2 * workers:
+                        start, end, future = pending.popleft()
+                        yield TranscriptSegment(start, end, future.result())
+                while pending:
+                    start, end, future = pending.popleft()
+                    yield TranscriptSegment(start, end, future.result())
         except Exception as e:
             raise Exception(f"Error in speech to text conversion: {str(e)}")
 
+    def _recognize_window(self, audio_data) -> str:
+        with span('stt_window'):
+            return self.stt_backend.recognize(audio_data)
+
+    def iter_partial_transcripts(self, audio_file, **options) -> Iterator[str]:
+        """Yield the stitched transcript so far after every window."""
+        segments = []
+        for segment in self.iter_transcript(audio_file, **options):
+            segments.append(segment)
+            yield stitch_segments(segments)
+
+    def speech_to_text(self, audio_file, **options):
+        return stitch_segments(self.iter_transcript(audio_file, **options))
+
     def cleanup_audio_file(self, file_path):
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
-            print(f"Error cleaning up audio file: {str(e)}")
\ No newline at end of file
+            print(f"Error cleaning up audio file: {str(e)}")
@@ -0,0 +1,10 @@
+"""Location of on-disk caches and stores shared by the utilities."""
+import os
+
+def default_cache_dir() -> str:
+    """``$RESUME_ENHANCER_CACHE_DIR`` or ``~/.cache/ai-resume-enhancer``; created on use."""
+    path = os.environ.get('RESUME_ENHANCER_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'ai-resume-enhancer'
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,84 @@
+"""Tokenized view of a text, built once and shared by every scorer."""
+import re
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple, Union
+
+from .keyword_engine import KeywordMatch, KeywordMatcher, matching_view
+
+# Words are runs of anything but whitespace and '.', which ends a sentence.
+_TOKEN_RE = re.compile(r'[^\s.]+|\.')
+
+DOCUMENT_CACHE_SIZE = 256
+
+class TextDocument:
+    """A text with its token offsets, sentence boundaries and lowercase view.
+
+    Token start/end offsets are stored in ``array('L')`` columns rather than
+    lists of tuples; ``sentence_starts[i]`` is the index of the first token
+    of sentence ``i``, with one extra entry for the end. Sentences are split
+    at '.', as the readability score has always done. Keyword matches are
+    computed once per matcher and kept on the document.
+    """
+
+    __slots__ = ('text', 'lower', 'token_starts', 'token_ends', 'sentence_starts', '_matches')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = matching_view(text)
+        starts = array('L')
+        ends = array('L')
+        sentence_starts = array('L', [0])
+        for match in _TOKEN_RE.finditer(text):
+            if match.group() == '.':
+                sentence_starts.append(len(starts))
+            else:
+                starts.append(match.start())
+                ends.append(match.end())
+        sentence_starts.append(len(starts))
+        self.token_starts = starts
+        self.token_ends = ends
+        self.sentence_starts = sentence_starts
+        self._matches: Dict[int, Tuple[KeywordMatcher, List[KeywordMatch]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.token_starts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts) - 1
+
+    def tokens(self) -> Iterator[str]:
+        text = self.text
+        for start, end in zip(self.token_starts, self.token_ends):
+            yield text[start:end]
+
+    def sentence_lengths(self) -> List[int]:
+        bounds = self.sentence_starts
+        return [bounds[i + 1] - bounds[i] for i in range(len(bounds) - 1)]
+
+    def keyword_matches(self, matcher: KeywordMatcher) -> List[KeywordMatch]:
+        """Matches of ``matcher`` over the lowercase view, computed once per matcher."""
+        cached = self._matches.get(id(matcher))
+        if cached is None or cached[0] is not matcher:
+            cached = (matcher, list(matcher.finditer_view(self.lower)))
+            self._matches[id(matcher)] = cached
+        return cached[1]
+
+    def keywords(self, matcher: KeywordMatcher) -> List[str]:
+        """Distinct matched terms in order of first appearance."""
+        return list(dict.fromkeys(match.term for match in self.keyword_matches(matcher)))
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _build_document(text: str) -> TextDocument:
+    return TextDocument(text)
+
+def get_document(text: Union[str, TextDocument]) -> TextDocument:
+    """The shared document for ``text``; documents pass through unchanged."""
+    if isinstance(text, TextDocument):
+        return text
+    return _build_document(text)
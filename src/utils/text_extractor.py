@@ -1,12 +1,221 @@
 """Text extraction utilities for PDF and DOCX files."""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional
+
 import fitz
 from docx import Document
 
-def extract_text_from_pdf(pdf_file):
-    doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
-    text = "\n".join(page.get_text() for page in doc)
-    return text
+from .metrics import record_size, span
+
+MAX_PDF_PAGES = 50
+MAX_PDF_BYTES = 25 * 1024 * 1024
+PDF_TIME_LIMIT = 30.0
+PARALLEL_MIN_PAGES = 40
+
+_COPY_CHUNK = 1024 * 1024
+
+class ExtractionLimitError(ValueError):
+    """The document exceeds a configured size, page or time limit."""
+
+class ExtractionTruncatedWarning(UserWarning):
+    """Pages were left out of a PDF's text because of a page or time limit."""
+
+class ExtractedText(NamedTuple):
+    text: str
+    # Why pages were left out, or None when the whole document was read
+    truncated: Optional[str] = None
+
+class _LimitedWriter:
+    def __init__(self, target, max_bytes):
+        self.target = target
+        self.max_bytes = max_bytes
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+        if self.max_bytes is not None and self.written > self.max_bytes:
+            raise ExtractionLimitError(
+                f"PDF is larger than {self.max_bytes // (1024 * 1024)} MB"
+            )
+        return self.target.write(data)
+
+@contextmanager
+def open_pdf(pdf_file, max_bytes: Optional[int] = MAX_PDF_BYTES):
+    """Open a PDF given as a path or a binary file-like object.
+
+    Streams are spooled to a temporary file in fixed-size chunks and opened
+    from disk, so MuPDF loads pages lazily instead of the whole upload being
+    held in memory as one bytes object.
+    """
+    spooled = None
+    if isinstance(pdf_file, (str, os.PathLike)):
+        if max_bytes is not None and os.path.getsize(pdf_file) > max_bytes:
+            raise ExtractionLimitError(
+                f"PDF is larger than {max_bytes // (1024 * 1024)} MB"
+            )
+        path = pdf_file
+    else:
+        if hasattr(pdf_file, 'seek'):
+            pdf_file.seek(0)
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+            spooled = tmp.name
+            try:
+                shutil.copyfileobj(pdf_file, _LimitedWriter(tmp, max_bytes), _COPY_CHUNK)
+            except ExtractionLimitError:
+                tmp.close()
+                os.remove(spooled)
+                raise
+        path = spooled
+
+    doc = None
+    try:
+        doc = fitz.open(path, filetype="pdf")
+        yield doc
+    finally:
+        if doc is not None:
+            doc.close()
+        if spooled:
+            os.remove(spooled)
 
+def _truncation(read: int, total: int, reason: str) -> str:
+    return f"{reason}; only the first {read} of {total} pages were read"
+
+def _iter_pages(pdf_file,
+                truncated: List[str],
+                max_pages: Optional[int] = MAX_PDF_PAGES,
+                max_bytes: Optional[int] = MAX_PDF_BYTES,
+                time_limit: Optional[float] = PDF_TIME_LIMIT,
+                strict: bool = False) -> Iterator[str]:
+    started = time.monotonic()
+    with open_pdf(pdf_file, max_bytes) as doc:
+        for number in range(doc.page_count):
+            if max_pages is not None and number >= max_pages:
+                reason = f"PDF has more than {max_pages} pages"
+            elif time_limit is not None and time.monotonic() - started > time_limit:
+                reason = f"PDF extraction took longer than {time_limit:.0f}s"
+            else:
+                yield doc.load_page(number).get_text()
+                continue
+            if strict:
+                raise ExtractionLimitError(reason)
+            truncated.append(_truncation(number, doc.page_count, reason))
+            return
+
+def iter_pdf_pages(pdf_file,
+                   max_pages: Optional[int] = MAX_PDF_PAGES,
+                   max_bytes: Optional[int] = MAX_PDF_BYTES,
+                   time_limit: Optional[float] = PDF_TIME_LIMIT,
+                   strict: bool = False) -> Iterator[str]:
+    """Yield the text of each page in order.
+
+    Only one page is decoded at a time, so callers can start working on the
+    first pages before the rest are extracted. Pages beyond ``max_pages`` or
+    after ``time_limit`` seconds are skipped with an
+    ExtractionTruncatedWarning, or raise ExtractionLimitError when
+    ``strict``. A file over ``max_bytes`` always raises. The time limit is
+    checked between pages, so a single slow page can run past it.
+    """
+    truncated: List[str] = []
+    yield from _iter_pages(pdf_file, truncated, max_pages, max_bytes, time_limit, strict)
+    if truncated:
+        warnings.warn(truncated[0], ExtractionTruncatedWarning, stacklevel=2)
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    # Runs in a worker process; each worker opens the document on its own.
+    with fitz.open(path, filetype="pdf") as doc:
+        return [doc.load_page(number).get_text() for number in range(start, stop)]
+
+def _parallel_pages(pdf_file,
+                    workers: Optional[int],
+                    truncated: List[str],
+                    max_pages: Optional[int] = MAX_PDF_PAGES,
+                    max_bytes: Optional[int] = MAX_PDF_BYTES,
+                    time_limit: Optional[float] = PDF_TIME_LIMIT,
+                    min_pages: int = PARALLEL_MIN_PAGES,
+                    strict: bool = False) -> List[str]:
+    with open_pdf(pdf_file, max_bytes) as doc:
+        page_count = doc.page_count
+        if max_pages is not None and page_count > max_pages:
+            reason = f"PDF has more than {max_pages} pages"
+            if strict:
+                raise ExtractionLimitError(reason)
+            truncated.append(_truncation(max_pages, page_count, reason))
+            page_count = max_pages
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or page_count < min_pages:
+            return [doc.load_page(number).get_text() for number in range(page_count)]
+
+        # A few slices per worker keeps the pool busy when pages differ in cost.
+        step = max(1, -(-page_count // (workers * 4)))
+        starts = list(range(0, page_count, step))
+        stops = [min(start + step, page_count) for start in starts]
+        # A Pool rather than an executor: on a timeout its workers are
+        # terminated, not left decoding pages of the spooled file that
+        # open_pdf is about to remove.
+        with multiprocessing.Pool(min(workers, len(starts))) as pool:
+            pending = pool.starmap_async(_extract_page_range,
+                                         zip([doc.name] * len(starts), starts, stops),
+                                         chunksize=1)
+            try:
+                slices = pending.get(time_limit)
+            except multiprocessing.TimeoutError:
+                raise ExtractionLimitError(
+                    f"PDF extraction took longer than {time_limit:.0f}s"
+                ) from None
+        return [text for chunk in slices for text in chunk]
+
+def extract_pdf_pages_parallel(pdf_file,
+                               workers: Optional[int] = None,
+                               max_pages: Optional[int] = MAX_PDF_PAGES,
+                               max_bytes: Optional[int] = MAX_PDF_BYTES,
+                               time_limit: Optional[float] = PDF_TIME_LIMIT,
+                               min_pages: int = PARALLEL_MIN_PAGES,
+                               strict: bool = False) -> List[str]:
+    """Extract page texts with the page range split across a process pool.
+
+    Documents shorter than ``min_pages`` are extracted serially, where pool
+    start-up would cost more than it saves. Results keep page order. Pages
+    beyond ``max_pages`` are skipped with an ExtractionTruncatedWarning (or
+    raise when ``strict``); the time limit applies to the whole pool and
+    always raises ExtractionLimitError, after the workers are terminated.
+    """
+    truncated: List[str] = []
+    pages = _parallel_pages(pdf_file, workers, truncated, max_pages, max_bytes,
+                            time_limit, min_pages, strict)
+    if truncated:
+        warnings.warn(truncated[0], ExtractionTruncatedWarning, stacklevel=2)
+    return pages
+
+@span('extract_pdf')
+def read_pdf_text(pdf_file, workers: Optional[int] = 1, **limits) -> ExtractedText:
+    """Text of a PDF, with the reason pages were left out if a page or time
+    limit cut it short. ``workers`` other than 1 enables page-parallel
+    extraction (``None`` uses every CPU)."""
+    truncated: List[str] = []
+    if workers == 1:
+        text = "\n".join(_iter_pages(pdf_file, truncated, **limits))
+    else:
+        text = "\n".join(_parallel_pages(pdf_file, workers, truncated, **limits))
+    record_size('extracted_text_chars', len(text))
+    return ExtractedText(text, truncated[0] if truncated else None)
+
+def extract_text_from_pdf(pdf_file, workers: Optional[int] = 1, **limits) -> str:
+    """Text of a PDF, as ``read_pdf_text``; a truncated document issues an
+    ExtractionTruncatedWarning."""
+    extracted = read_pdf_text(pdf_file, workers, **limits)
+    if extracted.truncated:
+        warnings.warn(extracted.truncated, ExtractionTruncatedWarning, stacklevel=2)
+    return extracted.text
+
+@span('extract_docx')
 def extract_text_from_docx(docx_file):
     doc = Document(docx_file)
-    return "\n".join(p.text for p in doc.paragraphs)
\ No newline at end of file
+    text = "\n".join(p.text for p in doc.paragraphs)
+    record_size('extracted_text_chars', len(text))
+    return text
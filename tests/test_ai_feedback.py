@@ -0,0 +1,86 @@
+"""
+Test streaming AI feedback with a fake model.
+"""
+import subprocess
+import sys
+
+import pytest
+
+from src.utils import ai_feedback
+from src.utils.llm_client import AsyncLLMClient
+from src.utils.response_cache import ResponseCache
+
+class FakeBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        return "Use metrics."
+
+    async def stream(self, prompt):
+        self.calls += 1
+        for chunk in ("Use ", "metrics."):
+            yield chunk
+
+@pytest.fixture
+def fake_gemini(monkeypatch, tmp_path):
+    backend = FakeBackend()
+    monkeypatch.setattr(ai_feedback, '_llm_client', AsyncLLMClient(backend))
+    monkeypatch.setattr(ai_feedback, '_response_cache', ResponseCache(str(tmp_path / "c.sqlite3")))
+    return backend
+
+def test_stream_records_timings_and_caches(fake_gemini):
+    timings = {}
+    chunks = list(ai_feedback.stream_suggestions("prompt", timings=timings))
+    assert chunks == ["Use ", "metrics."]
+    assert timings['cached'] is False
+    assert 0 <= timings['time_to_first_token'] <= timings['total_time']
+
+    timings = {}
+    assert list(ai_feedback.stream_suggestions("prompt", timings=timings)) == ["Use metrics."]
+    assert timings['cached'] is True
+    assert fake_gemini.calls == 1
+
+def test_get_ai_feedback(fake_gemini):
+    results = ai_feedback.get_ai_feedback("Skills\nPython", "Python and Docker", use_cache=False)
+    assert results['ai_suggestions'] == "Use metrics."
+    assert results['keyword_matches'] == {'matched': ['python'], 'missing': ['docker']}
+    assert results['section_analysis']['skills']['content'] == "Python"
+
+def test_refresh_bypasses_recorded_answer(fake_gemini):
+    pipeline = ai_feedback.build_analysis_pipeline()
+    args = (pipeline, "Skills\nPython", "Python")
+    assert "".join(ai_feedback.stream_pipeline_suggestions(*args)) == "Use metrics."
+    assert "".join(ai_feedback.stream_pipeline_suggestions(*args)) == "Use metrics."
+    assert fake_gemini.calls == 1
+
+    # Reuse of cached responses turned off: the model is asked again
+    timings = {}
+    chunks = list(ai_feedback.stream_pipeline_suggestions(*args, use_cache=False, timings=timings, refresh=True))
+    assert chunks == ["Use ", "metrics."]
+    assert timings['cached'] is False
+    assert fake_gemini.calls == 2
+
+def test_gemini_sdk_and_streamlit_imported_lazily():
+    code = ("import sys, src.utils.ai_feedback; "
+            "print('google.generativeai' in sys.modules, 'streamlit' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False False"
+
+def test_editing_job_description_keeps_resume_stages(fake_gemini):
+    pipeline = ai_feedback.build_analysis_pipeline()
+    resume = "Skills\nPython"
+    first = ai_feedback.get_ai_feedback(resume, "Python", pipeline=pipeline)
+    second = ai_feedback.get_ai_feedback(resume, "Python and Docker", pipeline=pipeline)
+    stats = pipeline.stats()
+    assert stats['document_scores'] == {'hits': 1, 'misses': 1}
+    assert stats['section_analysis'] == {'hits': 1, 'misses': 1}
+    assert stats['keyword_matches']['misses'] == 2
+    assert first['scores']['keyword_match'] == 100.0
+    assert second['scores']['keyword_match'] == 50.0
+    assert fake_gemini.calls == 2
+
+    # The recorded answer is reused without another model call
+    assert ai_feedback.get_ai_feedback(resume, "Python", pipeline=pipeline)['ai_suggestions'] == "Use metrics."
+    assert fake_gemini.calls == 2
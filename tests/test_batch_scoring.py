@@ -0,0 +1,34 @@
+"""
+Test bulk resume scoring.
+"""
+import json
+
+from docx import Document
+
+from src.utils.batch_scoring import collect_resume_files, main, score_resumes
+
+def _write_docx(path, text):
+    doc = Document()
+    doc.add_paragraph(text)
+    doc.save(str(path))
+
+def test_score_resumes_across_pool(tmp_path):
+    _write_docx(tmp_path / "a.docx", "Python and Docker engineer.")
+    _write_docx(tmp_path / "b.docx", "Java developer.")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    assert len(collect_resume_files([str(tmp_path)])) == 2
+    serial = list(score_resumes([str(tmp_path)], "Python Docker", workers=1))
+    pooled = list(score_resumes([str(tmp_path)], "Python Docker", workers=2))
+    assert serial == pooled
+    assert [r['scores']['keyword_match'] for r in serial] == [100.0, 0.0]
+
+def test_cli_writes_jsonl(tmp_path):
+    _write_docx(tmp_path / "a.docx", "Python engineer.")
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    out = tmp_path / "out.jsonl"
+    main([str(tmp_path), '--job-description', 'Python', '--workers', '1',
+          '--output', str(out)])
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert records[0]['keyword_matches']['matched'] == ['python']
+    assert 'error' in records[1]
@@ -0,0 +1,69 @@
+"""
+Test the digest-keyed extraction cache.
+"""
+import io
+
+import fitz
+from docx import Document
+
+from src.utils import extraction_cache
+from src.utils.extraction_cache import ExtractionCache, extract_cached, extract_text_cached
+
+class Upload(io.BytesIO):
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+def _docx_bytes(text):
+    doc = Document()
+    doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def test_identical_bytes_hit_cache(monkeypatch):
+    calls = []
+    real = extraction_cache.extract_text_from_docx
+    monkeypatch.setattr(extraction_cache, 'extract_text_from_docx',
+                        lambda f: calls.append(1) or real(f))
+    cache = ExtractionCache()
+    data = _docx_bytes("Python developer")
+
+    assert extract_text_cached(Upload(data, "a.docx"), cache=cache) == "Python developer"
+    assert extract_text_cached(Upload(data, "renamed.docx"), cache=cache) == "Python developer"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_memory_tier_is_size_bounded():
+    cache = ExtractionCache(max_memory_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "123456")
+    assert cache.get("a") is None
+    assert cache.get("b") == "123456"
+
+def test_disk_tier_persists_and_evicts(tmp_path):
+    ExtractionCache(disk_dir=str(tmp_path)).set("pdf:abc", "resume text")
+    fresh = ExtractionCache(disk_dir=str(tmp_path))
+    assert fresh.get("pdf:abc") == "resume text"
+
+    small = ExtractionCache(disk_dir=str(tmp_path), max_disk_bytes=60)
+    small.set("pdf:def", "more resume text")
+    assert len(list(tmp_path.iterdir())) == 1
+
+def test_truncation_note_survives_cache_hits(monkeypatch, tmp_path):
+    doc = fitz.open()
+    for number in range(3):
+        doc.new_page().insert_text((72, 72), f"Page {number + 1}")
+    data = doc.tobytes()
+    doc.close()
+    real = extraction_cache.read_pdf_text
+    monkeypatch.setattr(extraction_cache, 'read_pdf_text', lambda f: real(f, max_pages=1))
+    cache = ExtractionCache(disk_dir=str(tmp_path))
+
+    first = extract_cached(Upload(data, "cv.pdf"), cache=cache)
+    assert first.truncated.startswith("PDF has more than 1 pages")
+    assert extract_cached(Upload(data, "cv.pdf"), cache=cache) == first
+    assert extract_cached(Upload(data, "cv.pdf"), cache=ExtractionCache(disk_dir=str(tmp_path))) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Text and reason are one entry, so neither can be evicted alone
+    assert len(list(tmp_path.iterdir())) == 1
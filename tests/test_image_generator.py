@@ -0,0 +1,31 @@
+"""
+Test in-memory resume PDF rendering.
+"""
+import fitz
+
+from src.utils.image_generator import ResumeImageGenerator, get_resume_styles, render_resumes
+
+RESUME_DATA = {
+    'personal_info': {'name': "Jane Doe", 'email': "jane@example.com"},
+    'summary': "Engineer at R&D <lab>",
+    'skills': ["Python", {'Cloud': "AWS & GCP"}],
+}
+
+def _text(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "".join(page.get_text() for page in doc)
+
+def test_render_resume_in_memory():
+    pdf = ResumeImageGenerator().render_resume(RESUME_DATA)
+    assert pdf.startswith(b"%PDF")
+    text = _text(pdf)
+    assert "Jane Doe" in text and "R&D <lab>" in text and "AWS & GCP" in text
+
+def test_styles_are_shared():
+    assert ResumeImageGenerator().custom_style is get_resume_styles()['body']
+
+def test_batch_render_keeps_order():
+    batch = [dict(RESUME_DATA, personal_info={'name': f"Person {i}"}) for i in range(3)]
+    pdfs = render_resumes(batch, workers=2)
+    assert ["Person 0" in _text(p) for p in pdfs] == [True, False, False]
+    assert all(f"Person {i}" in _text(p) for i, p in enumerate(pdfs))
@@ -0,0 +1,51 @@
+"""
+Test compiled keyword matching.
+"""
+import time
+
+from src.utils.keyword_engine import KeywordMatcher, load_taxonomy
+from src.utils.resume_analyzer import calculate_keyword_match, extract_keywords
+
+def test_multi_word_and_punctuated_terms():
+    text = "Built Machine\nLearning pipelines with CI/CD and Problem Solving."
+    assert set(extract_keywords(text)) == {'machine learning', 'ci/cd', 'problem solving'}
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(['ai', 'java'])
+    assert matcher.find_all("maintain javascript") == []
+    assert [m.term for m in matcher.find_all("AI and Java.")] == ['ai', 'java']
+
+def test_offsets_and_counts():
+    text = "Python, python and more Python"
+    matcher = KeywordMatcher(['python', 'more python'])
+    matches = matcher.find_all(text)
+    assert [text[m.start:m.end] for m in matches] == ['Python', 'python', 'more Python', 'Python']
+    assert matcher.count(text) == {'python': 3, 'more python': 1}
+
+def test_overlapping_terms():
+    matcher = KeywordMatcher(['data', 'data science', 'science'])
+    assert sorted(matcher.count("data science").items()) == [
+        ('data', 1), ('data science', 1), ('science', 1)
+    ]
+
+def test_load_taxonomy(tmp_path):
+    txt = tmp_path / "terms.txt"
+    txt.write_text("# comment\nGo\n\nRust\n")
+    assert load_taxonomy(str(txt)) == ['Go', 'Rust']
+    js = tmp_path / "terms.json"
+    js.write_text('{"languages": ["go"], "skills": ["mentoring"]}')
+    assert load_taxonomy(str(js)) == ['go', 'mentoring']
+
+def test_keyword_match_uses_phrases():
+    matched, missing = calculate_keyword_match(
+        "Experienced in machine learning", "Machine learning and Docker"
+    )
+    assert matched == ['machine learning']
+    assert missing == ['docker']
+
+def test_large_taxonomy_scan():
+    matcher = KeywordMatcher([f"skill{i} tool{i}" for i in range(20000)])
+    text = "skill42 tool42 " * 2000
+    start = time.perf_counter()
+    assert matcher.count(text) == {'skill42 tool42': 2000}
+    assert time.perf_counter() - start < 2
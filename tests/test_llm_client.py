@@ -0,0 +1,82 @@
+"""
+Test the async LLM client against a local fake backend.
+"""
+import asyncio
+
+import pytest
+
+from src.utils.llm_client import (
+    AsyncLLMClient,
+    LLMClientError,
+    RateLimiter,
+    RetryBudget,
+    TokenBucket,
+    TransientLLMError,
+    iter_sync,
+    run_sync,
+)
+
+class FlakyBackend:
+    def __init__(self, failures, error=TransientLLMError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("quota exceeded")
+        return f"echo: {prompt}"
+
+    async def stream(self, prompt):
+        yield (await self.generate(prompt))[:5]
+        yield "..."
+
+def _client(backend, **kwargs):
+    kwargs.setdefault('base_delay', 0.001)
+    return AsyncLLMClient(backend, **kwargs)
+
+def test_retries_transient_errors():
+    backend = FlakyBackend(failures=2)
+    assert run_sync(_client(backend).generate("hi")) == "echo: hi"
+    assert backend.calls == 3
+
+def test_gives_up_with_friendly_error():
+    backend = FlakyBackend(failures=10)
+    with pytest.raises(LLMClientError, match="busy or over its quota"):
+        run_sync(_client(backend, max_attempts=3).generate("hi"))
+    assert backend.calls == 3
+
+def test_non_transient_errors_are_not_retried():
+    backend = FlakyBackend(failures=1, error=ValueError)
+    with pytest.raises(LLMClientError):
+        run_sync(_client(backend).generate("hi"))
+    assert backend.calls == 1
+
+def test_retry_budget_limits_retries():
+    backend = FlakyBackend(failures=10)
+    client = _client(backend, retry_budget=RetryBudget(initial=1, max_balance=1))
+    with pytest.raises(LLMClientError):
+        run_sync(client.generate("hi"))
+    assert backend.calls == 2
+
+def test_stream_through_sync_bridge():
+    backend = FlakyBackend(failures=1)
+    assert list(iter_sync(_client(backend).stream("hello"))) == ["echo:", "..."]
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(capacity=2, rate=100)
+    assert bucket.try_acquire(2) == 0
+    assert bucket.try_acquire(1) > 0
+
+    async def take_three():
+        limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=60_000)
+        limiter.requests = TokenBucket(capacity=1, rate=50)
+        for _ in range(3):
+            await limiter.acquire(10)
+
+    loop = asyncio.new_event_loop()
+    start = loop.time()
+    loop.run_until_complete(take_three())
+    assert loop.time() - start >= 0.03
+    loop.close()
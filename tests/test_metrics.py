@@ -0,0 +1,62 @@
+"""
+Test spans, sizes and metric export.
+"""
+import json
+import urllib.request
+
+from src.utils.metrics import MetricsRegistry, span, start_metrics_server
+
+def test_spans_nest_and_time_generators():
+    registry = MetricsRegistry()
+
+    @span('outer', registry)
+    def outer():
+        with span('inner', registry):
+            pass
+        return 1
+
+    @span('stream', registry)
+    def stream():
+        yield 1
+        yield 2
+
+    assert outer() == 1
+    assert list(stream()) == [1, 2]
+    records = registry.recent()
+    assert [(r.name, r.parent, r.depth) for r in records] == [
+        ('inner', 'outer', 1), ('outer', None, 0), ('stream', None, 0)
+    ]
+    assert registry.snapshot()['spans']['outer']['count'] == 1
+
+def test_errors_counted_and_reraised():
+    registry = MetricsRegistry()
+    try:
+        with span('failing', registry):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert registry.snapshot()['spans']['failing']['errors'] == 1
+    assert registry._stack() == []
+
+def test_prometheus_and_json_export():
+    registry = MetricsRegistry()
+    registry.observe_duration('extract "pdf"', 0.02)
+    registry.record_size('prompt_tokens', 120)
+    registry.increment('response_cache_hits')
+    text = registry.to_prometheus()
+    assert 'resume_enhancer_stage_duration_seconds_bucket{stage="extract \\"pdf\\"",le="0.025"} 1' in text
+    assert 'resume_enhancer_stage_duration_seconds_count{stage="extract \\"pdf\\""} 1' in text
+    assert 'resume_enhancer_payload_size_sum{name="prompt_tokens"} 120' in text
+    assert 'resume_enhancer_events_total{event="response_cache_hits"} 1' in text
+    assert json.loads(registry.to_json())['sizes']['prompt_tokens']['max'] == 120
+
+def test_metrics_server():
+    server = start_metrics_server(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert b"# TYPE resume_enhancer_stage_duration_seconds histogram" in response.read()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+            assert 'spans' in json.loads(response.read())
+    finally:
+        server.shutdown()
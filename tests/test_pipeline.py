@@ -0,0 +1,64 @@
+"""
+Test per-stage memoization in the analysis pipeline.
+"""
+import pytest
+
+from src.utils.pipeline import Pipeline, Stage
+
+def _pipeline(calls, max_entries=64):
+    def track(name, func):
+        def wrapped(*args):
+            calls.append(name)
+            return func(*args)
+        return wrapped
+    return Pipeline([
+        Stage('words', track('words', lambda text: text.split()), ('text',)),
+        Stage('shared', track('shared', lambda words, query: sorted(set(words) & set(query.split()))), ('words', 'query')),
+        Stage('report', track('report', lambda words, shared: f"{len(shared)}/{len(words)}"), ('words', 'shared')),
+        Stage('external', None, ('report',)),
+    ], max_entries=max_entries)
+
+def test_only_changed_stages_rerun():
+    calls = []
+    pipeline = _pipeline(calls)
+    assert pipeline.run({'text': "a b c", 'query': "b"})['report'] == "1/3"
+    assert calls == ['words', 'shared', 'report']
+
+    calls.clear()
+    assert pipeline.run({'text': "a b c", 'query': "b c"})['report'] == "2/3"
+    assert calls == ['shared', 'report']
+
+    calls.clear()
+    pipeline.run({'text': "a b c", 'query': "b"})
+    assert calls == []
+    assert pipeline.stats()['words'] == {'hits': 2, 'misses': 1}
+
+def test_targets_limit_work():
+    calls = []
+    pipeline = _pipeline(calls)
+    assert pipeline.run({'text': "x y"}, targets=['words']) == {'words': ['x', 'y']}
+    assert calls == ['words']
+
+def test_external_stage_store_and_lookup():
+    pipeline = _pipeline([])
+    inputs = {'text': "a b", 'query': "a"}
+    assert pipeline.lookup('external', inputs) is None
+    with pytest.raises(KeyError):
+        pipeline.run(inputs, targets=['external'])
+    pipeline.store('external', inputs, "answer")
+    assert pipeline.lookup('external', inputs) == "answer"
+    assert ('external', inputs) in pipeline
+    assert pipeline.lookup('external', {'text': "a b", 'query': "b"}) is None
+
+def test_lru_bound():
+    calls = []
+    pipeline = _pipeline(calls, max_entries=3)
+    pipeline.run({'text': "one", 'query': ""})
+    pipeline.run({'text': "two", 'query': ""})
+    calls.clear()
+    pipeline.run({'text': "one", 'query': ""})
+    assert calls == ['words', 'shared', 'report']
+
+def test_rejects_duplicate_stages():
+    with pytest.raises(ValueError):
+        Pipeline([Stage('a', len, ('text',)), Stage('a', len, ('text',))])
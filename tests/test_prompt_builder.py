@@ -0,0 +1,49 @@
+"""
+Test the token-budgeted prompt builder.
+"""
+from src.utils.ai_feedback import analyze_resume
+from src.utils.llm_client import estimate_tokens
+from src.utils.prompt_builder import (
+    build_prompt,
+    compact_resume,
+    drop_repeated_lines,
+    strip_jd_boilerplate,
+)
+
+def _resume(pages):
+    body = []
+    for page in range(1, pages + 1):
+        body += ["Jane Doe  -  Resume", "Experience", "Built Python services   on AWS."] * 3
+        body += ["Education", "BSc Physics, 2015"] * 20
+        body.append(f"Page {page} of {pages}")
+    return "\n".join(body)
+
+def test_drop_repeated_lines_keeps_first_occurrence():
+    text = "Jane Doe\nA\nPage 1\nJane Doe\nB\nPage 2 of 3\nJane Doe\n"
+    assert drop_repeated_lines(text) == "Jane Doe\nA\nB"
+
+def test_strip_jd_boilerplate():
+    jd = ("We need a Python engineer. We are an Equal Opportunity Employer.\n"
+          "All qualified applicants will receive consideration.\nDocker is a plus.")
+    assert strip_jd_boilerplate(jd) == "We need a Python engineer.\n\nDocker is a plus."
+
+def test_compact_resume_prefers_relevant_sections():
+    text = "Jane\nEducation\n" + "BSc Physics\n" * 50 + "Skills\nPython, Docker\n"
+    compacted = compact_resume(text, budget=40, job_keywords=['python'])
+    assert "Python, Docker" in compacted
+    assert estimate_tokens(compacted) <= 40 + 5
+
+def test_build_prompt_respects_budget_and_reports_savings():
+    resume = _resume(pages=8)
+    jd = "Python and AWS engineer. " * 50 + "We are an equal opportunity employer."
+    built = build_prompt(resume, jd, analyze_resume(resume, jd), token_budget=600)
+    assert built.tokens <= 600
+    assert built.tokens_saved > 0
+    assert "equal opportunity" not in built.prompt
+    assert "Page 3 of 8" not in built.prompt
+
+def test_short_inputs_pass_through():
+    resume = "Skills\nPython"
+    built = build_prompt(resume, None, analyze_resume(resume))
+    assert "Python" in built.prompt
+    assert "Job Description" not in built.prompt
@@ -0,0 +1,43 @@
+"""
+Test vectorised resume x job ranking.
+"""
+import time
+
+import pytest
+
+from src.utils.ranking import MatchMatrix
+from src.utils.resume_analyzer import calculate_resume_scores
+
+RESUMES = [
+    "Python developer with Docker and Kubernetes.",
+    "Java engineer, agile and scrum.",
+    "Machine learning in Python.",
+]
+JOBS = ["Python and Docker", "Java, scrum, leadership"]
+
+def test_binary_scores_match_pairwise_scoring():
+    matrix = MatchMatrix(RESUMES, JOBS)
+    for i, resume in enumerate(RESUMES):
+        for j, job in enumerate(JOBS):
+            expected = calculate_resume_scores(resume, job)['keyword_match']
+            assert matrix.scores[i, j] == pytest.approx(expected, abs=1e-3)
+
+def test_top_k_both_directions():
+    matrix = MatchMatrix(RESUMES, JOBS)
+    assert [i for i, _ in matrix.top_candidates(k=2)[0]] == [0, 2]
+    assert [j for j, _ in matrix.top_jobs(k=1)[1]] == [1]
+    assert len(matrix.top_jobs(k=5)[0]) == 2
+
+def test_tfidf_weighting():
+    matrix = MatchMatrix(RESUMES, JOBS, weighting='tfidf')
+    assert matrix.top_candidates(k=1)[1][0][0] == 1
+    assert 0 <= matrix.scores.min() and matrix.scores.max() <= 100.001
+
+def test_scales_to_large_grid():
+    resumes = [RESUMES[i % 3] for i in range(3000)]
+    jobs = [JOBS[i % 2] for i in range(200)]
+    start = time.perf_counter()
+    matrix = MatchMatrix(resumes, jobs)
+    matrix.top_candidates(k=10)
+    assert matrix.shape == (3000, 200)
+    assert time.perf_counter() - start < 5
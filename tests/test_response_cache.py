@@ -0,0 +1,47 @@
+"""
+Test the persistent LLM response cache.
+"""
+from src.utils.response_cache import ResponseCache, cache_key
+
+def test_hits_misses_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    calls = []
+    generate = lambda: calls.append(1) or "feedback"
+
+    assert cache.get_or_generate("model", "prompt", generate) == "feedback"
+    assert cache.get_or_generate("model", "prompt", generate) == "feedback"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    reopened = ResponseCache(path)
+    assert reopened.get(cache_key("model", "prompt")) == "feedback"
+    assert reopened.get(cache_key("other-model", "prompt")) is None
+
+def test_bypass_and_disabled(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.get_or_generate("m", "p", lambda: "old")
+    assert cache.get_or_generate("m", "p", lambda: "new", bypass=True) == "new"
+    cache.enabled = False
+    assert cache.get_or_generate("m", "p", lambda: "fresh") == "fresh"
+    assert cache.stats()['entries'] == 1
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=-1)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+    assert cache.stats()['entries'] == 0
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+    small = ResponseCache(str(tmp_path / "small.sqlite3"), max_bytes=10)
+    small.set("x", "12345")
+    small.set("y", "123456")
+    assert small.get("x") is None and small.get("y") == "123456"
@@ -0,0 +1,69 @@
+"""
+Test resume section segmentation.
+"""
+from src.utils.resume_analyzer import analyze_resume_sections, extract_section
+from src.utils.section_segmenter import (
+    build_resume_data,
+    get_section_index,
+    segment_sections,
+)
+
+RESUME = """Jane Doe
+jane@example.com
+
+PROFESSIONAL SUMMARY
+Backend engineer with 6 years of experience.
+
+Work Experience
+Acme Corp - built payment APIs.
+
+Skills: Python, SQL, Docker
+
+## Projects
+Resume parser.
+
+Education
+BSc Computer Science
+"""
+
+def test_segments_all_headers_in_order():
+    spans = segment_sections(RESUME)
+    assert [s.section for s in spans] == [
+        'contact', 'summary', 'experience', 'skills', 'projects', 'education'
+    ]
+    skills = spans[3]
+    assert RESUME[skills.start:skills.end].strip() == "Python, SQL, Docker"
+
+def test_analyzers_read_from_index():
+    sections = analyze_resume_sections(RESUME)
+    assert sections['experience']['content'] == "Acme Corp - built payment APIs."
+    assert sections['projects']['content'] == "Resume parser."
+    assert extract_section(RESUME, 'awards') == ""
+
+def test_index_is_memoized_per_document():
+    first = get_section_index(RESUME)
+    assert get_section_index(RESUME).spans is first.spans
+    assert get_section_index(RESUME + "\nAwards\nHackathon winner").get('awards') == "Hackathon winner"
+
+def test_repeated_headers_are_joined():
+    text = "Projects\nA\nSkills\nGo\nProjects\nB\n"
+    assert get_section_index(text).get('projects') == "A\nB"
+
+def test_sub_labels_stay_in_their_section():
+    text = (
+        "Skills\nLanguages: Python, Java, Go\nTechnologies: Docker, AWS\n"
+        "Experience\nLab assistant\nResearch: protein folding\n"
+        "Languages\nSpanish\n"
+    )
+    index = get_section_index(text)
+    assert index.sections() == ['skills', 'experience', 'languages']
+    assert index.get('skills') == "Languages: Python, Java, Go\nTechnologies: Docker, AWS"
+    assert index.get('experience') == "Lab assistant\nResearch: protein folding"
+    assert index.get('languages') == "Spanish"
+
+def test_build_resume_data():
+    data = build_resume_data(RESUME)
+    assert data['personal_info']['name'] == "Jane Doe"
+    assert data['personal_info']['email'] == "jane@example.com"
+    assert data['education'] == "BSc Computer Science"
+    assert 'contact' not in data
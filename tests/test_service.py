@@ -0,0 +1,184 @@
+"""
+Test the headless scoring service over HTTP.
+"""
+import base64
+import http.client
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from docx import Document
+
+from src import service
+from src.utils import ai_feedback
+from src.utils.llm_client import AsyncLLMClient
+from src.utils.metrics import get_registry
+from src.utils.response_cache import ResponseCache
+
+class FakeBackend:
+    async def generate(self, prompt):
+        return "Use metrics."
+
+    async def stream(self, prompt):
+        yield "Use metrics."
+
+@pytest.fixture
+def server():
+    scoring = service.ScoringService(queue_size=1, executor=ThreadPoolExecutor(2), api_key="test-key")
+    httpd = service.make_server(scoring, port=0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    scoring.shutdown()
+
+def _post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url + "/v1/analyze", data=body, headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def _docx_bytes(text):
+    buffer = io.BytesIO()
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def test_text_request(server):
+    status, result = _post(server, json.dumps({
+        'resume_text': "Skills\nPython", 'job_description': "Python and Docker"
+    }).encode())
+    assert status == 200
+    assert result['keyword_matches'] == {'matched': ['python'], 'missing': ['docker']}
+    assert result['scores']['keyword_match'] == 50.0
+    assert 'ai_suggestions' not in result and 'resume_text' not in result
+
+def test_file_uploads(server):
+    data = _docx_bytes("Jane Doe\nSkills\nPython, Kubernetes")
+    status, result = _post(server, json.dumps({
+        'resume_base64': base64.b64encode(data).decode(), 'filename': "cv.docx"
+    }).encode())
+    assert status == 200
+    assert result['section_analysis']['skills']['content'] == "Python, Kubernetes"
+
+    boundary = "xyz"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"cv.docx\"\r\n"
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + data + (
+        f"\r\n--{boundary}\r\nContent-Disposition: form-data; name=\"job_description\"\r\n\r\n"
+        f"Kubernetes\r\n--{boundary}--\r\n"
+    ).encode()
+    status, result = _post(server, body, f"multipart/form-data; boundary={boundary}")
+    assert status == 200
+    assert result['keyword_matches']['matched'] == ['kubernetes']
+
+def test_client_errors(server):
+    assert _post(server, b"not json")[0] == 400
+    assert _post(server, b"x", "text/plain")[0] == 415
+    status, result = _post(server, json.dumps({
+        'resume_base64': base64.b64encode(b"x").decode(), 'filename': "cv.txt"
+    }).encode())
+    assert status == 422 and "Unsupported" in result['error']
+    for filename in ("cv.pdf", "cv.docx"):
+        status, result = _post(server, json.dumps({
+            'resume_base64': base64.b64encode(b"not a document").decode(), 'filename': filename
+        }).encode())
+        assert status == 422 and result['error'].startswith(f"Could not read {filename}")
+        assert "/tmp" not in result['error']
+    status, result = _post(server, json.dumps({'resume_text': 5}).encode())
+    assert status == 400 and "resume_text" in result['error']
+    assert _post(server, json.dumps({'resume_base64': "é", 'filename': "cv.pdf"}).encode())[0] == 400
+
+def test_internal_errors_are_500(server, monkeypatch):
+    def broken(*args):
+        raise ValueError("bug in scoring")
+    monkeypatch.setattr(service, 'analyze_document', broken)
+    status, result = _post(server, json.dumps({'resume_text': "Python"}).encode())
+    assert status == 500 and "bug in scoring" in result['error']
+    assert "service_analysis" in get_registry().snapshot()['spans']
+
+@pytest.mark.parametrize('length, status', [(None, 411), ('-1', 400), ('0', 400), ('abc', 411)])
+def test_bad_content_length(server, length, status):
+    connection = http.client.HTTPConnection(server.split('//')[1], timeout=5)
+    connection.putrequest('POST', '/v1/analyze')
+    connection.putheader('Content-Type', 'application/json')
+    if length is not None:
+        connection.putheader('Content-Length', length)
+    connection.endheaders()
+    assert connection.getresponse().status == status
+    connection.close()
+
+def test_backpressure_returns_503(server, monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+    original = service.analyze_document
+
+    def slow(*args):
+        started.set()
+        release.wait(5)
+        return original(*args)
+
+    monkeypatch.setattr(service, 'analyze_document', slow)
+    body = json.dumps({'resume_text': "Python"}).encode()
+    first = []
+    worker = threading.Thread(target=lambda: first.append(_post(server, body)))
+    worker.start()
+    assert started.wait(5)
+    status, result = _post(server, body)
+    release.set()
+    worker.join()
+    assert status == 503
+    assert first[0][0] == 200
+
+def test_timed_out_work_keeps_its_slot(monkeypatch):
+    release = threading.Event()
+    original = service.analyze_document
+    monkeypatch.setattr(service, 'analyze_document', lambda *args: release.wait(5) and original(*args))
+    scoring = service.ScoringService(queue_size=1, timeout=0.2, executor=ThreadPoolExecutor(1))
+    try:
+        with pytest.raises(service.RequestError) as timed_out:
+            scoring.analyze("Python")
+        assert timed_out.value.status == 504
+        # The timed-out analysis is still running, so the queue is full
+        with pytest.raises(service.RequestError) as busy:
+            scoring.analyze("Python")
+        assert busy.value.status == 503
+        assert scoring.in_flight == 1
+
+        release.set()
+        scoring.executor.submit(lambda: None).result(5)
+        assert scoring.in_flight == 0
+        assert scoring.analyze("Python")['characters'] == 6
+    finally:
+        release.set()
+        scoring.shutdown()
+
+def test_feedback(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(ai_feedback, '_llm_client', AsyncLLMClient(FakeBackend()))
+    monkeypatch.setattr(ai_feedback, '_response_cache', ResponseCache(str(tmp_path / "c.sqlite3")))
+    monkeypatch.setattr(service, 'initialize_gemini', lambda api_key: None)
+    status, result = _post(server, json.dumps({'resume_text': "Python", 'feedback': True}).encode())
+    assert status == 200
+    assert result['ai_suggestions'] == "Use metrics."
+    assert result['prompt_stats']['prompt_tokens'] > 0
+
+def test_feedback_without_api_key(monkeypatch):
+    monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+    monkeypatch.setattr(ai_feedback, 'initialize_gemini', lambda api_key=None: pytest.fail("model called"))
+    scoring = service.ScoringService(executor=ThreadPoolExecutor(1))
+    try:
+        with pytest.raises(service.RequestError) as missing:
+            scoring.analyze("Python", feedback=True)
+        assert missing.value.status == 501
+        assert 'ai_suggestions' not in scoring.analyze("Python")
+    finally:
+        scoring.shutdown()
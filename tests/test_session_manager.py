@@ -0,0 +1,124 @@
+"""
+Test session history and learning data.
+"""
+import pytest
+import streamlit as st
+
+from src.utils.history_store import HistoryStore
+from src.utils.learning_store import LearningStore
+from src.utils.session_manager import MAX_SECTION_SAMPLES, TOP_KEYWORDS, SessionManager
+
+class State(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+@pytest.fixture
+def store(tmp_path):
+    return LearningStore(str(tmp_path / "learning.sqlite3"))
+
+@pytest.fixture
+def session(monkeypatch, store):
+    monkeypatch.setattr(st, 'session_state', State())
+    return SessionManager(learning_store=store)
+
+def _results(text="Python"):
+    return {
+        'scores': {'readability': 80.0},
+        'keyword_matches': {'matched': ['python'], 'missing': []},
+        'section_analysis': {'skills': {'content': text, 'suggestions': "Group skills."}},
+        'ai_suggestions': "- Add metrics\n- Use action verbs",
+    }
+
+def test_history_round_trip_and_latest(session):
+    session.add_to_history("resume A", _results(), "job 1")
+    session.add_to_history("resume B", _results())
+    session.add_to_history("resume A", _results(), "job 2", is_modified=True)
+    history = session.get_history()
+    assert [h['resume_text'] for h in history] == ["resume A", "resume B", "resume A"]
+    assert [h['is_latest'] for h in history] == [False, True, True]
+    assert history[2]['job_description'] == "job 2"
+    assert history[2]['analysis_results'] == _results()
+
+def test_identical_texts_are_stored_once(session):
+    resume = "Experienced Python engineer. " * 200
+    for job in ("job 1", "job 2", "job 3"):
+        session.add_to_history(resume, _results(), job)
+    footprint = session.memory_footprint()
+    assert footprint['unique_bodies'] == 5
+    assert footprint['stored_bytes'] < len(resume)
+
+def test_history_is_capped():
+    store = HistoryStore(max_entries=2)
+    for i in range(5):
+        store.add(f"resume {i}", {'i': i})
+    assert [e['resume_text'] for e in store.entries()] == ["resume 3", "resume 4"]
+    assert store.memory_footprint()['unique_bodies'] == 4
+
+def test_section_samples_are_bounded(session):
+    for i in range(MAX_SECTION_SAMPLES + 5):
+        session.add_to_history(f"resume {i}", _results(f"skills {i}"))
+    patterns = st.session_state.learning_data['section_patterns']['skills']
+    assert len(patterns) == MAX_SECTION_SAMPLES
+    assert session.get_learned_insights()['section_patterns'] == {'skills': MAX_SECTION_SAMPLES + 5}
+
+def test_lineages_group_versions(session):
+    session.add_to_history("resume v1", _results(), lineage_id="backend cv")
+    session.add_to_history("other resume", _results())
+    session.add_to_history("resume v2", _results(), lineage_id="backend cv")
+    grouped = session.get_history_by_lineage()
+    assert list(grouped)[0] == "backend cv"
+    assert [e['resume_text'] for e in grouped["backend cv"]] == ["resume v1", "resume v2"]
+    assert [e['is_latest'] for e in grouped["backend cv"]] == [False, True]
+    assert all(len(versions) == 1 for key, versions in grouped.items() if key != "backend cv")
+
+def test_eviction_updates_lineages():
+    store = HistoryStore(max_entries=2)
+    first = store.add("a", {}, lineage_id="cv")
+    store.add("b", {}, lineage_id="cv")
+    latest = store.add("c", {}, lineage_id="cv")
+    assert first not in store.lineages()["cv"]
+    assert store.latest_entry_id("cv") == latest and store.is_latest(latest)
+
+def test_learning_persists_across_sessions(monkeypatch, session, store):
+    session.add_to_history("resume", _results())
+    session.add_to_history("resume", {**_results(), 'ai_suggestions': "- Add metrics"})
+
+    monkeypatch.setattr(st, 'session_state', State())
+    insights = SessionManager(learning_store=LearningStore(store.path)).get_learned_insights()
+    assert insights['top_keywords'] == ['python']
+    assert insights['common_improvements'] == {'Add metrics': 2, 'Use action verbs': 1}
+    assert insights['section_patterns'] == {'skills': 2}
+
+def test_top_k_reads_counters_in_order(store):
+    for i in range(50):
+        store.increment('keyword', [f"kw{j}" for j in range(i % 10 + 1)])
+    assert [term for term, _ in store.top('keyword', 3)] == ['kw0', 'kw1', 'kw2']
+    assert store.size('keyword') == 10
+
+def test_personalized_suggestions_match_whole_words(session, store):
+    store.increment('keyword', ['ai', 'docker', 'machine learning'])
+    suggestions = session.get_personalized_suggestions(
+        "I maintain Docker images and do Machine\nLearning."
+    )
+    assert suggestions[0] == "Consider adding these successful keywords: ai"
+
+def test_personalized_suggestions_agree_with_scoring(session, store):
+    store.increment('keyword', ['kubernetes', 'docker'])
+    suggestions = session.get_personalized_suggestions("Ran k8s clusters")
+    assert suggestions[0] == "Consider adding these successful keywords: docker"
+
+def test_personalized_suggestions_are_capped_to_top_keywords(session, store):
+    store.increment('keyword', ['python'] * 3 + ['docker'] * 2)
+    store.increment('keyword', [f"rare{i}" for i in range(TOP_KEYWORDS * 2)])
+    suggestions = session.get_personalized_suggestions("Python developer")
+    suggested = suggestions[0].split(": ", 1)[1].split(", ")
+    assert len(suggested) == TOP_KEYWORDS - 1
+    assert suggested[0] == 'docker' and 'python' not in suggested
+
+def test_matcher_is_rebuilt_only_when_terms_change(store):
+    store.increment('keyword', ['python'])
+    first = store.matcher('keyword')
+    store.increment('keyword', ['python'])
+    assert store.matcher('keyword') is first
+    store.increment('keyword', ['rust'])
+    assert 'rust' in store.matcher('keyword')
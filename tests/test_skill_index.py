@@ -0,0 +1,92 @@
+"""
+Test skill alias and spelling normalization.
+"""
+import json
+import time
+
+import pytest
+
+from src.utils import resume_analyzer
+from src.utils.resume_analyzer import calculate_keyword_match, extract_keywords
+from src.utils.skill_index import (
+    SkillIndex,
+    SkillMatcher,
+    bounded_edit_distance,
+    load_skill_aliases,
+    load_skill_index
+)
+
+def test_aliases_count_as_canonical_keywords():
+    matched, missing = calculate_keyword_match(
+        "Deployed React.js and Node.js services on k8s and AWS Lambda; built ML models.",
+        "Kubernetes, React, Node, AWS, machine learning and Docker"
+    )
+    assert matched == ['kubernetes', 'react', 'node', 'aws', 'machine learning']
+    assert missing == ['docker']
+
+def test_misspellings_within_one_edit():
+    assert extract_keywords("Pyhton, Kubernates and javscript") == ['python', 'kubernetes', 'javascript']
+    # Short words and unrelated words are left alone
+    assert extract_keywords("I maintain a scrub brush and cloudy logs") == []
+
+def test_common_words_are_not_misspelled_skills():
+    assert extract_keywords("Backed by data, I docked the boat for a backer") == []
+    assert resume_analyzer.get_keyword_matcher().index.canonical('backed') is None
+    matched, missing = calculate_keyword_match(
+        "Python dev", "We are a startup backed by top VCs; Python required."
+    )
+    assert (matched, missing) == (['python'], [])
+    # Real misspellings of the same skills still match
+    assert extract_keywords("Backedn and Dcoker") == ['backend', 'docker']
+
+def test_overlapping_aliases_are_one_mention():
+    matcher = resume_analyzer.get_keyword_matcher()
+    assert matcher.count("AWS Lambda and AWS") == {'aws': 2}
+    text = "Used ReactJS"
+    match, = matcher.find_all(text)
+    assert (match.term, text[match.start:match.end]) == ('react', "ReactJS")
+
+def test_ambiguous_spelling_is_not_guessed():
+    index = SkillIndex({'golang': [], 'gopher': []}, min_fuzzy_length=5)
+    assert index.canonical('golang') == 'golang'
+    assert index.canonical('golanb') == 'golang'
+    assert index.canonical('gophar') == 'gopher'
+    ambiguous = SkillIndex({'abcdef': [], 'abcdeg': []}, min_fuzzy_length=5)
+    assert ambiguous.canonical('abcdex') is None
+
+def test_restricted_index_keeps_aliases_for_vocabulary():
+    index = SkillIndex({'kubernetes': ['k8s'], 'terraform': ['hcl']})
+    matcher = SkillMatcher(['Kubernetes', 'helm'], index)
+    assert matcher.terms == ('helm', 'kubernetes')
+    assert matcher.unique("k8s, HCL and Helm charts") == ['kubernetes', 'helm']
+
+def test_conflicting_aliases_rejected():
+    with pytest.raises(ValueError):
+        SkillIndex({'go': ['golang'], 'golang': []})
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("python", "pyhton", 1) == 1
+    assert bounded_edit_distance("kitten", "sitting", 3) == 3
+    assert bounded_edit_distance("kitten", "sitting", 1) == 2
+
+def test_loaded_from_data_file(tmp_path, monkeypatch):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"rust": ["rustlang"]}))
+    assert load_skill_index(str(path)).canonical("RustLang") == 'rust'
+    monkeypatch.setenv('RESUME_ENHANCER_SKILLS_FILE', str(path))
+    assert load_skill_aliases() == {"rust": ["rustlang"]}
+
+def test_set_skill_index_keeps_taxonomy(monkeypatch):
+    monkeypatch.setattr(resume_analyzer, '_keyword_matcher', resume_analyzer._keyword_matcher)
+    monkeypatch.setattr(resume_analyzer, '_skill_index', resume_analyzer._skill_index)
+    resume_analyzer.set_skill_index(SkillIndex({'python': ['snake']}))
+    assert extract_keywords("snake and docker") == ['python', 'docker']
+
+def test_fuzzy_lookup_cost_independent_of_taxonomy_size():
+    index = SkillIndex({f"skill{i:05d}x": [] for i in range(50000)})
+    start = time.perf_counter()
+    for i in range(2000):
+        assert index.fuzzy(f"unrelated{i}") is None
+    per_lookup = (time.perf_counter() - start) / 2000
+    assert per_lookup < 0.001
+    assert index.canonical("skill01234y") == 'skill01234x'
@@ -0,0 +1,96 @@
+"""
+Test chunked text-to-speech with an offline engine.
+"""
+import array
+import io
+import subprocess
+import sys
+import threading
+import wave
+
+from src.utils.speech_handler import SpeechHandler, split_sentences, stitch_segments
+
+class OfflineEngine:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def synthesize(self, text, lang):
+        with self.lock:
+            self.calls.append(text)
+        return f"[{lang}:{text}]".encode()
+
+def test_split_sentences_packs_and_splits():
+    text = "One. Two!\nThree? " + "word " * 30
+    chunks = split_sentences(text, max_chars=40)
+    assert chunks[0] == "One. Two! Three?"
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+def test_chunks_synthesized_in_order_and_cached(tmp_path):
+    engine = OfflineEngine()
+    handler = SpeechHandler(tts_engine=engine, cache_dir=str(tmp_path))
+    text = " ".join(f"Sentence number {i}." for i in range(40))
+
+    audio = handler.text_to_speech_bytes(text)
+    chunks = split_sentences(text)
+    assert audio == b"".join(f"[en:{c}]".encode() for c in chunks)
+    assert len(engine.calls) == len(chunks) > 1
+
+    assert handler.text_to_speech_bytes(text) == audio
+    assert len(engine.calls) == len(chunks)
+    handler.text_to_speech_bytes(text, lang='fr')
+    assert len(engine.calls) == 2 * len(chunks)
+
+def test_first_chunk_available_before_the_rest(tmp_path):
+    release = threading.Event()
+
+    class SlowTail(OfflineEngine):
+        def synthesize(self, text, lang):
+            if not text.startswith("First"):
+                release.wait(5)
+            return super().synthesize(text, lang)
+
+    handler = SpeechHandler(tts_engine=SlowTail(), cache_dir=str(tmp_path))
+    parts = handler.iter_speech("First part." + " Tail sentence here." * 40)
+    assert next(parts).startswith(b"[en:First")
+    release.set()
+    assert len(list(parts)) >= 1
+
+class SecondsStub:
+    """Recognizes a WAV whose every second holds one constant sample value."""
+
+    def recognize(self, audio_data):
+        samples = array.array('h', audio_data.frame_data)
+        rate = audio_data.sample_rate
+        return " ".join(f"s{samples[i] // 100}" for i in range(0, len(samples), rate))
+
+def _seconds_wav(seconds, rate=1000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        for second in range(seconds):
+            wav.writeframes(array.array('h', [second * 100] * rate).tobytes())
+    buffer.seek(0)
+    return buffer
+
+def test_windowed_transcription_with_overlap(tmp_path):
+    handler = SpeechHandler(tts_engine=OfflineEngine(), cache_dir=str(tmp_path),
+                            stt_backend=SecondsStub())
+    segments = list(handler.iter_transcript(_seconds_wav(10), window=4, overlap=1, workers=2))
+    assert [(s.start, s.end) for s in segments] == [(0, 4), (3, 7), (6, 10)]
+    assert segments[1].text == "s3 s4 s5 s6"
+    assert stitch_segments(segments) == " ".join(f"s{i}" for i in range(10))
+
+    partials = list(handler.iter_partial_transcripts(_seconds_wav(10), window=4, overlap=1))
+    assert partials[0] == "s0 s1 s2 s3" and partials[-1].endswith("s9")
+
+def test_gtts_imported_lazily_and_recognizer_shared(tmp_path):
+    code = "import sys, src.utils.speech_handler; print('gtts' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+    first = SpeechHandler(tts_engine=OfflineEngine(), cache_dir=str(tmp_path))
+    second = SpeechHandler(tts_engine=OfflineEngine(), cache_dir=str(tmp_path))
+    assert first.recognizer is second.recognizer
@@ -0,0 +1,58 @@
+"""
+Test the shared tokenized document and its use by the scorers.
+"""
+import random
+
+from src.utils import resume_analyzer
+from src.utils.keyword_engine import KeywordMatcher
+from src.utils.resume_analyzer import calculate_readability_score, calculate_resume_scores
+from src.utils.text_document import TextDocument, get_document
+
+class CountingMatcher(KeywordMatcher):
+    def __init__(self, terms):
+        super().__init__(terms)
+        self.passes = 0
+
+    def finditer_view(self, view):
+        self.passes += 1
+        return super().finditer_view(view)
+
+def _old_readability(text):
+    sentences = text.split('.')
+    avg = sum(len(s.split()) for s in sentences) / len(sentences)
+    return max(0, min(100, 100 - (avg - 15) * 2))
+
+def test_tokens_and_sentences():
+    doc = TextDocument("Built node.js APIs.  Led a team\nof five. ")
+    assert list(doc.tokens()) == ["Built", "node", "js", "APIs", "Led", "a", "team", "of", "five"]
+    assert doc.sentence_count == 4
+    assert doc.sentence_lengths() == [2, 2, 5, 0]
+    assert doc.lower.startswith("built node.js apis.")
+    assert doc.token_starts.typecode == 'L'
+
+def test_readability_matches_previous_definition():
+    rng = random.Random(3)
+    words = ["Led", "team.", "of", "python", "engineers", "...", "ci/cd", "3.5", ""]
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+        assert calculate_readability_score(text) == _old_readability(text)
+
+def test_keyword_matches_computed_once_per_document():
+    matcher = CountingMatcher(["python", "machine learning"])
+    doc = TextDocument("Python and Machine Learning, python again")
+    assert doc.keywords(matcher) == ["python", "machine learning"]
+    assert len(doc.keyword_matches(matcher)) == 3
+    assert matcher.passes == 1
+
+def test_documents_are_shared_and_passed_through():
+    text = "Skills\nPython and Docker."
+    assert get_document(text) is get_document(text)
+    doc = get_document(text)
+    assert get_document(doc) is doc
+
+def test_precomputed_keyword_match_is_reused(monkeypatch):
+    def fail(*args):
+        raise AssertionError("keyword match recomputed")
+    monkeypatch.setattr(resume_analyzer, 'calculate_keyword_match', fail)
+    scores = calculate_resume_scores("Python", "Python and Docker", keyword_match=(['python'], ['docker']))
+    assert scores['keyword_match'] == 50.0
@@ -1,13 +1,105 @@
 """
 Test resume text extraction functionality.
 """
+import io
+import multiprocessing
+import time
+
+import fitz
 import pytest
-from src.utils.text_extractor import extract_text_from_pdf, extract_text_from_docx
+from docx import Document
+
+from src.utils import text_extractor
+from src.utils.text_extractor import (
+    ExtractionLimitError,
+    ExtractionTruncatedWarning,
+    extract_pdf_pages_parallel,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+    iter_pdf_pages,
+    read_pdf_text,
+)
+
+def _pdf_bytes(pages):
+    doc = fitz.open()
+    for number in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {number + 1} Python")
+    data = doc.tobytes()
+    doc.close()
+    return data
 
 def test_pdf_extraction():
-    # Add test implementation
-    pass
+    upload = io.BytesIO(_pdf_bytes(3))
+    text = extract_text_from_pdf(upload)
+    assert [line for line in text.splitlines() if line] == [
+        "Page 1 Python", "Page 2 Python", "Page 3 Python"
+    ]
+    # Re-reading the same upload (a Streamlit rerun) starts from the beginning
+    assert extract_text_from_pdf(upload) == text
+
+def test_pdf_extraction_from_path(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(_pdf_bytes(2))
+    assert "Page 2" in extract_text_from_pdf(str(path))
+
+def test_pdf_pages_are_streamed_and_capped():
+    pages = iter_pdf_pages(io.BytesIO(_pdf_bytes(10)), max_pages=4)
+    assert next(pages).startswith("Page 1")
+    with pytest.warns(ExtractionTruncatedWarning, match="first 4 of 10 pages"):
+        assert len(list(pages)) == 3
+    with pytest.raises(ExtractionLimitError):
+        list(iter_pdf_pages(io.BytesIO(_pdf_bytes(10)), max_pages=4, strict=True))
+
+def test_truncation_is_reported():
+    data = _pdf_bytes(6)
+    assert read_pdf_text(io.BytesIO(data)).truncated is None
+    extracted = read_pdf_text(io.BytesIO(data), max_pages=2)
+    assert "Page 3" not in extracted.text
+    assert extracted.truncated == "PDF has more than 2 pages; only the first 2 of 6 pages were read"
+    assert read_pdf_text(io.BytesIO(data), workers=2, max_pages=2).truncated == extracted.truncated
+    with pytest.warns(ExtractionTruncatedWarning):
+        extract_text_from_pdf(io.BytesIO(data), time_limit=-1)
+
+def test_pdf_byte_limit():
+    with pytest.raises(ExtractionLimitError):
+        extract_text_from_pdf(io.BytesIO(_pdf_bytes(5)), max_bytes=100)
 
 def test_docx_extraction():
-    # Add test implementation
-    pass
\ No newline at end of file
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("Skills: Python")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    assert extract_text_from_docx(buffer) == "Jane Doe\nSkills: Python"
+
+def test_parallel_pdf_extraction_keeps_page_order():
+    data = _pdf_bytes(12)
+    serial = extract_text_from_pdf(io.BytesIO(data))
+    pages = extract_pdf_pages_parallel(io.BytesIO(data), workers=3, min_pages=0)
+    assert "\n".join(pages) == serial
+    assert pages[11].startswith("Page 12")
+    # Short documents fall back to serial extraction
+    assert extract_text_from_pdf(io.BytesIO(data), workers=None) == serial
+
+def _slow_page_range(path, start, stop):
+    time.sleep(30)
+    return []
+
+def test_parallel_timeout_stops_workers(monkeypatch):
+    data = _pdf_bytes(8)
+    spooled = []
+    real_open = text_extractor.fitz.open
+
+    def open_and_note(path, **kwargs):
+        spooled.append(path)
+        return real_open(path, **kwargs)
+    monkeypatch.setattr(text_extractor.fitz, 'open', open_and_note)
+    monkeypatch.setattr(text_extractor, '_extract_page_range', _slow_page_range)
+
+    started = time.monotonic()
+    with pytest.raises(ExtractionLimitError):
+        extract_pdf_pages_parallel(io.BytesIO(data), workers=2, min_pages=0, time_limit=0.5)
+    assert time.monotonic() - started < 10
+    assert multiprocessing.active_children() == []
+    assert not text_extractor.os.path.exists(spooled[0])